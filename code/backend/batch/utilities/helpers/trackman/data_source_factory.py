@@ -2,15 +2,17 @@
 
 import logging
 import os
+import threading
 from typing import Optional
 
 from .data_source_interface import TrackmanDataSource
-from .excel_data_source import ExcelDataSource
+from .excel_data_source import ExcelDataSource, clear_workbook_cache
 from .redshift_data_source import RedshiftDataSource
 
 logger = logging.getLogger(__name__)
 
 _data_source_instance: Optional[TrackmanDataSource] = None
+_data_source_lock = threading.Lock()
 
 
 def get_data_source() -> TrackmanDataSource:
@@ -32,6 +34,16 @@ def get_data_source() -> TrackmanDataSource:
     if _data_source_instance is not None:
         return _data_source_instance
 
+    with _data_source_lock:
+        # Another thread may have finished construction while we waited
+        if _data_source_instance is None:
+            _data_source_instance = _build_data_source()
+
+    return _data_source_instance
+
+
+def _build_data_source() -> TrackmanDataSource:
+    """Construct the configured data source, falling back to Excel."""
     use_redshift = os.getenv("USE_REDSHIFT", "false").lower() == "true"
 
     if use_redshift:
@@ -51,27 +63,36 @@ def get_data_source() -> TrackmanDataSource:
                     f"USE_REDSHIFT=true but missing environment variables: {', '.join(missing_vars)}. "
                     "Falling back to Excel data source."
                 )
-                _data_source_instance = ExcelDataSource()
+                return ExcelDataSource()
             else:
                 logger.info("Initializing Redshift data source")
-                _data_source_instance = RedshiftDataSource()
+                data_source = RedshiftDataSource()
                 logger.info("Redshift data source active")
+                return data_source
 
         except Exception as e:
             logger.error(
                 f"Failed to initialize Redshift data source: {str(e)}. "
                 "Falling back to Excel data source."
             )
-            _data_source_instance = ExcelDataSource()
+            return ExcelDataSource()
     else:
         logger.info("Initializing Excel data source (USE_REDSHIFT not set to true)")
-        _data_source_instance = ExcelDataSource()
+        data_source = ExcelDataSource()
         logger.info("Excel data source active")
-
-    return _data_source_instance
+        return data_source
 
 
 def reset_data_source():
-    """Reset the data source instance (useful for testing)."""
+    """Reset the data source instance (useful for testing).
+
+    The previous instance is closed so its connection pool or refresh
+    thread does not outlive it, and workbooks parsed by earlier Excel
+    sources are dropped so the next one reads the files again.
+    """
     global _data_source_instance
-    _data_source_instance = None
+    with _data_source_lock:
+        previous, _data_source_instance = _data_source_instance, None
+    if previous is not None:
+        previous.close()
+    clear_workbook_cache()
@@ -7,6 +7,14 @@ from typing import Dict, Optional
 class TrackmanDataSource(ABC):
     """Abstract base class for Trackman data sources."""
 
+    # True when the source caches its own query results and drops them when
+    # its data reloads, so callers should not cache on top of it
+    memoizes_queries = False
+
+    # Queries the source can serve at once, e.g. its connection pool size;
+    # None when it has no limit
+    max_concurrent_queries: Optional[int] = None
+
     @abstractmethod
     def get_errors_summary(
         self, range_days: int, facility_id: Optional[str] = None
@@ -30,7 +38,11 @@ class TrackmanDataSource(ABC):
 
     @abstractmethod
     def get_top_error_messages(
-        self, range_days: int, limit: int = 10, facility_id: Optional[str] = None
+        self,
+        range_days: int,
+        limit: int = 10,
+        facility_id: Optional[str] = None,
+        approximate: bool = False,
     ) -> Dict:
         """
         Get top error messages by frequency.
@@ -39,6 +51,8 @@ class TrackmanDataSource(ABC):
             range_days: Number of days to look back
             limit: Maximum number of results to return
             facility_id: Optional facility ID to filter by
+            approximate: Allow counts estimated from a random sample of the
+                rows, which may differ between calls
 
         Returns:
             Dict with structure:
@@ -131,3 +145,7 @@ class TrackmanDataSource(ABC):
             }
         """
         pass
+
+    def close(self):
+        """Release connections, threads or other resources held by the source."""
+        pass
@@ -1,18 +1,214 @@
 """Excel-based Trackman data source implementation.
 Scans data/testtrack directory for Excel files and merges data from all sheets."""
 
+import functools
+import hashlib
+import inspect
 import logging
+import multiprocessing
 import os
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
 
 from .data_source_interface import TrackmanDataSource
+from .redshift_config import ALLOWED_TABLES
 
 logger = logging.getLogger(__name__)
 
+# calamine (Rust) is much faster than openpyxl and reads every requested
+# sheet from the one opened archive; without it pandas falls back to openpyxl
+try:
+    import python_calamine  # noqa: F401
+
+    EXCEL_ENGINE: Optional[str] = "calamine"
+except ImportError:
+    EXCEL_ENGINE = None
+
+EXPECTED_SHEETS = ["errors", "connectivity", "facility_metadata", "data_quality"]
+CACHE_DIR_NAME = ".cache"
+QUERY_CACHE_SIZE = 256
+NS_PER_DAY = 86_400 * 10**9
+WORKBOOK_CACHE_SIZE = 16
+
+# Low-cardinality string columns stored as pandas categoricals
+CATEGORICAL_COLUMNS = [
+    "facility_id",
+    "severity",
+    "connectivity_status",
+    "disconnect_reason",
+    "error_code",
+    "unit_model",
+    "unit_id",
+]
+
+# Text columns read as strings so IDs and codes are never inferred as numbers.
+# Those not stored as categoricals use Arrow-backed strings: contiguous UTF-8
+# buffers instead of one Python object per cell
+STRING_COLUMNS = CATEGORICAL_COLUMNS + [
+    "error_message",
+    "location",
+    "opening_hours",
+    "subscription_status",
+]
+
+# Shared stand-in for missing sheets and empty results; never mutated
+_EMPTY_FRAME = pd.DataFrame()
+
+# Parsed sheets of each workbook keyed by (resolved path, mtime), shared by all
+# instances in the process so a new data source skips parsing unchanged files.
+# The frames are never mutated; merging always builds new ones
+_workbook_cache: OrderedDict = OrderedDict()
+_workbook_cache_lock = threading.Lock()
+
+# Keep cached string columns Arrow-backed when converting back to pandas
+_ARROW_STRING_TYPES = {
+    pa.string(): pd.StringDtype("pyarrow"),
+    pa.large_string(): pd.StringDtype("pyarrow"),
+}
+
+
+@dataclass(frozen=True)
+class _IndexedSheets:
+    """Merged sheets and the indexes built from them.
+
+    Replaced as a whole on every reload. Each query reads the instance once
+    at entry, so a concurrent refresh can never mix new frames with the row
+    positions of old ones.
+    """
+
+    data: Dict[str, pd.DataFrame]
+    ts_ns: Dict[str, np.ndarray]
+    by_facility: Dict[str, Dict[str, np.ndarray]]
+    category_codes: Dict[str, Dict[str, Dict[str, int]]]
+
+
+_EMPTY_SHEETS = _IndexedSheets(
+    data={sheet: _EMPTY_FRAME for sheet in EXPECTED_SHEETS},
+    ts_ns={},
+    by_facility={},
+    category_codes={},
+)
+
+
+def _copy_result(result: Dict) -> Dict:
+    """Copy of a result dict whose lists and rows the caller may mutate.
+
+    Cell values are immutable scalars, so copying the containers is enough.
+    """
+    return {
+        **result,
+        "columns": list(result["columns"]),
+        "rows": [list(row) for row in result["rows"]],
+        "metadata": dict(result["metadata"]),
+    }
+
+
+def _cached_query(method):
+    """Memoize a query method per instance for TRACKMAN_CACHE_TTL seconds.
+
+    Between reloads the frames do not change, so a result only moves with
+    the date-range cutoff, which advances with the clock; keying on a time
+    bucket of TRACKMAN_CACHE_TTL seconds lets identical requests within it
+    skip the groupby work. refresh() clears the cache, and a result computed
+    while a reload happened is not stored. A TTL of 0 disables the cache.
+    """
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        ttl = float(os.getenv("TRACKMAN_CACHE_TTL", "300"))
+        if ttl <= 0:
+            return method(self, *args, **kwargs)
+
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple(bound.arguments.values())[1:]
+        key = (method.__name__, int(time.time() // ttl), *arguments)
+
+        with self._query_cache_lock:
+            result = self._query_cache.get(key)
+            if result is not None:
+                self._query_cache.move_to_end(key)
+            data_version = self._data_version
+
+        if result is None:
+            result = method(self, *args, **kwargs)
+            with self._query_cache_lock:
+                if data_version != self._data_version:
+                    return _copy_result(result)
+                self._query_cache[key] = result
+                if len(self._query_cache) > QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+
+        return _copy_result(result)
+
+    return wrapper
+
+
+def _parse_workbook(excel_path: Path) -> Optional[Dict[str, pd.DataFrame]]:
+    """Parse the expected sheets of a single Excel file.
+
+    Defined at module level so it can run in a worker process. Errors are
+    logged and yield None so one bad file does not abort the load; callers
+    must not cache that result, since the failure may be transient.
+    """
+    sheets = {}
+    try:
+        logger.info(f"Loading file: {excel_path.name}")
+        excel_file = pd.ExcelFile(excel_path, engine=EXCEL_ENGINE)
+
+        present = [name for name in EXPECTED_SHEETS if name in excel_file.sheet_names]
+        for sheet_name in EXPECTED_SHEETS:
+            if sheet_name not in present:
+                logger.debug(f"  Sheet '{sheet_name}' not found in {excel_path.name}")
+
+        if not present:
+            return sheets
+
+        for sheet_name in present:
+            # Parse only the allowlisted columns, with string types declared
+            # up front instead of inferred. Date cells come back from calamine
+            # already typed; parse_dates would round-trip them through strings
+            # and infer one format, dropping whole-second values when others
+            # carry fractions.
+            columns = ALLOWED_TABLES[sheet_name]
+            df = excel_file.parse(
+                sheet_name,
+                usecols=lambda col, columns=columns: col in columns,
+                dtype={col: str for col in STRING_COLUMNS if col in columns},
+            )
+
+            # Coerce only when some timestamp cells were not stored as dates
+            if "timestamp" in df.columns and not pd.api.types.is_datetime64_any_dtype(
+                df["timestamp"]
+            ):
+                df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+
+            sheets[sheet_name] = df
+            logger.info(f"  Loaded sheet '{sheet_name}' with {len(df)} rows")
+
+    except Exception as e:
+        logger.error(f"Error loading file {excel_path.name}: {e}")
+        return None
+
+    return sheets
+
+
+def clear_workbook_cache():
+    """Drop the parsed workbooks shared by all ExcelDataSource instances."""
+    with _workbook_cache_lock:
+        _workbook_cache.clear()
+
 
 class ExcelDataSource(TrackmanDataSource):
     """Excel-based implementation of Trackman data source.
@@ -21,6 +217,8 @@ class ExcelDataSource(TrackmanDataSource):
     from matching sheets across all files.
     """
 
+    memoizes_queries = True
+
     def __init__(self, data_dir: Optional[str] = None):
         """
         Initialize Excel data source.
@@ -33,96 +231,579 @@ class ExcelDataSource(TrackmanDataSource):
         if data_dir is None:
             data_dir = os.getenv("TRACKMAN_DATA_DIR", "data/testtrack")
 
-        self.data_dir = Path(data_dir)
-        self._data = {}
+        self._init_state(Path(data_dir))
         self._load_data()
 
+        refresh_interval = float(os.getenv("TRACKMAN_REFRESH_INTERVAL", "0"))
+        if refresh_interval > 0:
+            self.start_auto_refresh(refresh_interval)
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> "ExcelDataSource":
+        """
+        Build a data source from in-memory sheets instead of Excel files.
+
+        Args:
+            frames: Sheet name to DataFrame, laid out like the Excel sheets.
+                    Missing sheets are empty and unknown ones are ignored. The frames get the same
+                    dtype conversion and indexes as parsed workbooks, without
+                    touching disk; the source has no data_dir and never refreshes.
+        """
+        source = cls.__new__(cls)
+        source._init_state(None)
+        sheets = {name: df for name, df in frames.items() if name in EXPECTED_SHEETS}
+        source._build_indexes(source._merge_frames({Path("<memory>"): sheets}))
+        return source
+
+    def _init_state(self, data_dir: Optional[Path]):
+        self.data_dir = data_dir
+        self._state = _EMPTY_SHEETS
+        self._file_mtimes: Dict[Path, int] = {}
+        self._per_file_frames: Dict[Path, Dict[str, pd.DataFrame]] = {}
+        self._query_cache: OrderedDict = OrderedDict()
+        self._query_cache_lock = threading.Lock()
+        self._data_version = 0
+        self._refresh_lock = threading.Lock()
+        self._stop_refresh = threading.Event()
+
+    @property
+    def _data(self) -> Dict[str, pd.DataFrame]:
+        """Merged sheets of the current state."""
+        return self._state.data
+
+    @property
+    def cache_dir(self) -> Optional[Path]:
+        """Directory of the Arrow IPC cache; None for sources built from frames."""
+        return self.data_dir / CACHE_DIR_NAME if self.data_dir is not None else None
+
+    def row_counts(self) -> Dict[str, int]:
+        """Number of rows loaded for each expected sheet."""
+        return {sheet: len(df) for sheet, df in self._state.data.items()}
+
     def _load_data(self):
-        """Load all sheets from all Excel files in directory and merge them."""
+        """Load all sheets from all Excel files in directory, merge and index them."""
         try:
             logger.info(f"Scanning for Trackman Excel files in: {self.data_dir}")
 
-            if not self.data_dir.exists():
-                logger.warning(f"Data directory not found: {self.data_dir}")
-                self._initialize_empty_data()
+            excel_files = self._scan_files()
+            if not excel_files:
                 return
 
-            # Find all Excel files
-            excel_files = list(self.data_dir.glob("*.xlsx")) + list(self.data_dir.glob("*.xls"))
+            logger.info(
+                f"Found {len(excel_files)} Excel file(s): {[f.name for f in excel_files]}"
+            )
+            self._file_mtimes = {path: path.stat().st_mtime_ns for path in excel_files}
+
+            # Skip Excel parsing entirely when the files are unchanged since the last load
+            fingerprint = self._fingerprint(excel_files)
+            data = self._read_cache(fingerprint)
+            if data is not None:
+                logger.info("Excel data loaded from columnar cache")
+                self._build_indexes(data)
+                return
 
-            if not excel_files:
-                logger.warning(f"No Excel files found in {self.data_dir}")
-                self._initialize_empty_data()
+            parsed = dict(zip(excel_files, self._parse_files(excel_files)))
+            self._per_file_frames = {
+                path: frames for path, frames in parsed.items() if frames is not None
+            }
+            self._build_indexes(self._merge_frames(self._per_file_frames))
+            logger.info("Excel data loaded and merged successfully")
+
+            failed = self._forget_failed(parsed)
+            if failed:
+                logger.warning(f"Not caching Excel data; failed to parse {failed}")
                 return
 
-            logger.info(f"Found {len(excel_files)} Excel file(s): {[f.name for f in excel_files]}")
+            # Cache the indexed frames so later loads can map them as-is
+            self._write_cache(fingerprint)
+
+        except Exception as e:
+            logger.error(f"Error loading Excel files: {str(e)}")
+            # Forget the files so the next refresh loads them again rather
+            # than treating the empty data as current
+            self._state = _EMPTY_SHEETS
+            self._file_mtimes = {}
+            self._per_file_frames = {}
+
+    def refresh(self) -> bool:
+        """Reload the data if Excel files were added, removed or modified.
+
+        Only files whose modification time changed are parsed again; the other
+        files reuse their previously parsed frames. Files loaded from the
+        columnar cache have no per-file frames yet and are parsed on the first
+        refresh that sees a change. Returns True when the data was reloaded.
+        """
+        if self.data_dir is None:
+            return False
+
+        with self._refresh_lock:
+            excel_files = self._scan_files()
+            file_mtimes = {path: path.stat().st_mtime_ns for path in excel_files}
+            if file_mtimes == self._file_mtimes:
+                return False
+
+            frames = {
+                path: self._per_file_frames[path]
+                for path in excel_files
+                if path in self._per_file_frames
+                and self._file_mtimes.get(path) == file_mtimes[path]
+            }
+            changed = [path for path in excel_files if path not in frames]
+            logger.info(f"Reloading {len(changed)} changed Excel file(s)")
+            parsed = dict(zip(changed, self._parse_files(changed)))
+            frames.update(
+                (path, sheets) for path, sheets in parsed.items() if sheets is not None
+            )
+
+            data = self._merge_frames(frames)
+            self._per_file_frames = frames
+            self._file_mtimes = file_mtimes
+            self._build_indexes(data)
+            if excel_files and not self._forget_failed(parsed):
+                self._write_cache(self._fingerprint(excel_files))
 
-            # Initialize accumulators for each sheet type
-            expected_sheets = ["errors", "connectivity", "facility_metadata", "data_quality"]
-            sheet_dataframes = {sheet: [] for sheet in expected_sheets}
+            with self._query_cache_lock:
+                self._query_cache.clear()
+                self._data_version += 1
 
-            # Load data from each file
-            for excel_path in excel_files:
-                try:
-                    logger.info(f"Loading file: {excel_path.name}")
-                    excel_file = pd.ExcelFile(excel_path)
+            return True
 
-                    for sheet_name in expected_sheets:
-                        if sheet_name in excel_file.sheet_names:
-                            df = pd.read_excel(excel_file, sheet_name=sheet_name)
+    def _forget_failed(
+        self, parsed: Dict[Path, Optional[Dict[str, pd.DataFrame]]]
+    ) -> List[str]:
+        """Names of the files that failed to parse, dropped from the recorded mtimes.
 
-                            # Convert timestamp columns to datetime
-                            if "timestamp" in df.columns:
-                                df["timestamp"] = pd.to_datetime(df["timestamp"], errors="coerce")
+        The next refresh then sees them as changed and parses them again.
+        """
+        failed = [path for path, sheets in parsed.items() if sheets is None]
+        for path in failed:
+            self._file_mtimes.pop(path, None)
+        return [path.name for path in failed]
 
-                            sheet_dataframes[sheet_name].append(df)
-                            logger.info(f"  Loaded sheet '{sheet_name}' with {len(df)} rows")
-                        else:
-                            logger.debug(f"  Sheet '{sheet_name}' not found in {excel_path.name}")
+    def start_auto_refresh(self, interval_seconds: float = 60.0):
+        """Poll data_dir for changed files every interval_seconds in a daemon thread."""
 
+        def poll():
+            while not self._stop_refresh.wait(interval_seconds):
+                try:
+                    self.refresh()
                 except Exception as e:
-                    logger.error(f"Error loading file {excel_path.name}: {e}")
-                    continue
-
-            # Merge all dataframes for each sheet
-            for sheet_name in expected_sheets:
-                dfs = sheet_dataframes[sheet_name]
-                if dfs:
-                    merged_df = pd.concat(dfs, ignore_index=True)
-                    # Remove duplicate rows
-                    merged_df = merged_df.drop_duplicates()
-                    self._data[sheet_name] = merged_df
-                    logger.info(f"Merged sheet '{sheet_name}': {len(merged_df)} total rows")
-                else:
-                    logger.warning(f"No data found for sheet '{sheet_name}' across all files")
-                    self._data[sheet_name] = pd.DataFrame()
+                    logger.error(f"Error refreshing Excel data: {str(e)}")
+
+        self._stop_refresh.clear()
+        threading.Thread(
+            target=poll, name="trackman-excel-refresh", daemon=True
+        ).start()
+
+    def stop_auto_refresh(self):
+        """Stop the polling thread started by start_auto_refresh."""
+        self._stop_refresh.set()
+
+    def close(self):
+        """Stop background refreshing."""
+        self.stop_auto_refresh()
+
+    def _scan_files(self) -> List[Path]:
+        """All Excel files in data_dir, sorted by path."""
+        if not self.data_dir.exists():
+            logger.warning(f"Data directory not found: {self.data_dir}")
+            return []
+
+        excel_files = sorted(
+            list(self.data_dir.glob("*.xlsx")) + list(self.data_dir.glob("*.xls"))
+        )
+        if not excel_files:
+            logger.warning(f"No Excel files found in {self.data_dir}")
+        return excel_files
+
+    @staticmethod
+    def _parse_files(
+        excel_files: List[Path],
+    ) -> List[Optional[Dict[str, pd.DataFrame]]]:
+        """Parse each file's expected sheets, in the order given; None for files that failed.
+
+        Files already parsed in this process at the same modification time
+        are taken from the shared workbook cache. Failed files are not cached.
+        """
+        keys = [(path.resolve(), path.stat().st_mtime_ns) for path in excel_files]
+        parsed = {}
+        with _workbook_cache_lock:
+            for key in keys:
+                if key in _workbook_cache:
+                    _workbook_cache.move_to_end(key)
+                    parsed[key] = _workbook_cache[key]
+        missing = [
+            (path, key) for path, key in zip(excel_files, keys) if key not in parsed
+        ]
+        paths = [path for path, _ in missing]
+
+        # Parse files in parallel: Excel parsing is CPU-bound and independent per file.
+        # Workers are spawned, not forked: this also runs on the refresh thread
+        # of a multi-threaded server, where a fork can copy locks held by
+        # other threads and deadlock the child
+        sheets = None
+        if len(paths) > 1:
+            max_workers = min(len(paths), os.cpu_count() or 1)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                ) as executor:
+                    sheets = list(executor.map(_parse_workbook, paths))
+            except Exception as e:
+                # Workers may be unable to start or to import __main__; the
+                # files can still be parsed here, only more slowly
+                logger.warning(f"Excel parser pool failed, parsing in-process: {e}")
+        if sheets is None:
+            sheets = [_parse_workbook(path) for path in paths]
+
+        with _workbook_cache_lock:
+            for (_, key), frames in zip(missing, sheets):
+                parsed[key] = frames
+                if frames is not None:
+                    _workbook_cache[key] = frames
+            while len(_workbook_cache) > WORKBOOK_CACHE_SIZE:
+                _workbook_cache.popitem(last=False)
+
+        return [parsed[key] for key in keys]
+
+    @staticmethod
+    def _merge_frames(
+        per_file_frames: Dict[Path, Dict[str, pd.DataFrame]]
+    ) -> Dict[str, pd.DataFrame]:
+        """Merge the parsed sheets of all files into one frame per sheet."""
+        # Initialize accumulators for each sheet type
+        sheet_dataframes = {sheet: [] for sheet in EXPECTED_SHEETS}
+        for path in sorted(per_file_frames):
+            for sheet_name, df in per_file_frames[path].items():
+                sheet_dataframes[sheet_name].append(df)
+
+        # Merge all dataframes for each sheet
+        data = {}
+        for sheet_name in EXPECTED_SHEETS:
+            dfs = sheet_dataframes[sheet_name]
+            if dfs:
+                merged_df = pd.concat(dfs, ignore_index=True)
+                for col in STRING_COLUMNS:
+                    if col in merged_df.columns:
+                        merged_df[col] = merged_df[col].astype(
+                            "category"
+                            if col in CATEGORICAL_COLUMNS
+                            else "string[pyarrow]"
+                        )
+
+                # Remove duplicate rows. Done after the categorical conversion,
+                # so those columns are compared on their integer codes
+                merged_df = merged_df.drop_duplicates()
+                data[sheet_name] = merged_df
+                logger.info(f"Merged sheet '{sheet_name}': {len(merged_df)} total rows")
+            else:
+                logger.warning(
+                    f"No data found for sheet '{sheet_name}' across all files"
+                )
+                data[sheet_name] = _EMPTY_FRAME
 
-            logger.info("Excel data loaded and merged successfully")
+        return data
+
+    @staticmethod
+    def _fingerprint(excel_files: List[Path]) -> str:
+        """Build a stable key from the parsed schema and each file's path and mtime.
 
+        hashlib is used rather than hash() so the key survives process restarts.
+        """
+        digest = hashlib.sha256()
+        # The parsed columns and their storage types are part of the key, so
+        # schema or dtype changes miss the cache
+        digest.update(repr(sorted(ALLOWED_TABLES.items())).encode())
+        digest.update(repr((CATEGORICAL_COLUMNS, STRING_COLUMNS)).encode())
+        for path in sorted(excel_files):
+            digest.update(f"{path.resolve()}:{path.stat().st_mtime_ns}\n".encode())
+        return digest.hexdigest()[:16]
+
+    def _cache_path(self, sheet_name: str, fingerprint: str) -> Path:
+        """Path of the Arrow IPC cache file for a sheet."""
+        return self.cache_dir / f"{sheet_name}_{fingerprint}.arrow"
+
+    def _read_cache(self, fingerprint: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """Load all sheets from the Arrow IPC cache. Returns None on a cache miss.
+
+        The files are memory-mapped, so numeric columns are backed by the OS
+        page cache and shared by every worker process that loads them.
+        """
+        paths = {
+            sheet: self._cache_path(sheet, fingerprint) for sheet in EXPECTED_SHEETS
+        }
+        if not all(path.exists() for path in paths.values()):
+            return None
+
+        try:
+            data = {
+                sheet: pa.ipc.open_file(pa.memory_map(str(path)))
+                .read_all()
+                .to_pandas(split_blocks=True, types_mapper=_ARROW_STRING_TYPES.get)
+                for sheet, path in paths.items()
+            }
         except Exception as e:
-            logger.error(f"Error loading Excel files: {str(e)}")
-            self._initialize_empty_data()
+            logger.warning(f"Ignoring unreadable Excel cache: {e}")
+            return None
 
-    def _initialize_empty_data(self):
-        """Initialize empty dataframes for all expected sheets."""
-        for sheet in ["errors", "connectivity", "facility_metadata", "data_quality"]:
-            self._data[sheet] = pd.DataFrame()
+        for sheet, df in data.items():
+            logger.info(f"Loaded sheet '{sheet}' from cache with {len(df)} rows")
+        return data
 
-    def _filter_by_date_range(self, df: pd.DataFrame, range_days: int) -> pd.DataFrame:
-        """Filter dataframe by timestamp within range_days."""
-        if "timestamp" not in df.columns or df.empty:
-            return df
+    def _write_cache(self, fingerprint: str):
+        """Persist the merged sheets as Arrow IPC files and drop caches of older file versions.
+
+        Each file is written under a temporary name and renamed into place, so
+        a worker starting concurrently never maps a partially written file.
+        """
+        cache_dir = self.cache_dir
+        try:
+            cache_dir.mkdir(exist_ok=True)
+            for sheet in EXPECTED_SHEETS:
+                path = self._cache_path(sheet, fingerprint)
+                for stale in cache_dir.glob(f"{sheet}_*"):
+                    if stale != path:
+                        stale.unlink(missing_ok=True)
+
+                table = pa.Table.from_pandas(
+                    self._state.data[sheet], preserve_index=False
+                )
+                tmp_path = cache_dir / f".{path.name}.{os.getpid()}.tmp"
+                with pa.OSFile(str(tmp_path), "wb") as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+                os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not write Excel cache to {cache_dir}: {e}")
 
-        cutoff_date = datetime.now() - timedelta(days=range_days)
-        return df[df["timestamp"] >= cutoff_date]
+    def _build_indexes(self, data: Dict[str, pd.DataFrame]):
+        """Sort time series by timestamp and index row positions by facility.
 
-    def _filter_by_facility(
-        self, df: pd.DataFrame, facility_id: Optional[str]
+        Rows without a valid timestamp can never fall inside a date range, so
+        they are dropped here; this keeps the timestamp index strictly sortable.
+        The new frames and indexes replace the current state in one assignment.
+        """
+        data = dict(data)
+        ts_ns = {}
+        by_facility = {}
+        category_codes = {}
+
+        for sheet_name, df in data.items():
+            if "timestamp" in df.columns:
+                # Frames loaded from the cache are already clean; keep them
+                # as-is so their memory-mapped columns are not copied
+                timestamps = df["timestamp"]
+                if (
+                    timestamps.hasnans
+                    or not timestamps.is_monotonic_increasing
+                    or not isinstance(df.index, pd.RangeIndex)
+                ):
+                    df = (
+                        df.dropna(subset=["timestamp"])
+                        .sort_values("timestamp", kind="mergesort")
+                        .reset_index(drop=True)
+                    )
+                    data[sheet_name] = df
+                # Plain int64 nanoseconds: searches compare raw integers
+                ts_ns[sheet_name] = (
+                    df["timestamp"].to_numpy(dtype="datetime64[ns]").view("i8")
+                )
+
+            if "facility_id" in df.columns:
+                by_facility[sheet_name] = df.groupby(
+                    "facility_id", sort=False, observed=True
+                ).indices
+
+            # Resolve labels to codes once so filters compare small integers
+            category_codes[sheet_name] = {
+                col: {label: code for code, label in enumerate(df[col].cat.categories)}
+                for col in df.columns
+                if isinstance(df[col].dtype, pd.CategoricalDtype)
+            }
+
+        self._state = _IndexedSheets(
+            data=data,
+            ts_ns=ts_ns,
+            by_facility=by_facility,
+            category_codes=category_codes,
+        )
+
+    def _range_start(
+        self, state: _IndexedSheets, sheet_name: str, range_days: Optional[int]
+    ) -> int:
+        """Position of the first row of a sheet within range_days.
+
+        A binary search on the sorted timestamp index, so the date filter
+        never scans the whole sheet. The cutoff is computed directly in int64
+        nanoseconds, the unit of the index.
+        """
+        if range_days is None or sheet_name not in state.ts_ns:
+            return 0
+
+        now_ns = np.datetime64(datetime.now(), "ns").astype(np.int64)
+        cutoff_ns = now_ns - np.int64(round(range_days * NS_PER_DAY))
+        return int(np.searchsorted(state.ts_ns[sheet_name], cutoff_ns))
+
+    def _facility_positions(
+        self,
+        state: _IndexedSheets,
+        sheet_name: str,
+        range_days: Optional[int],
+        facility_id: str,
+    ) -> np.ndarray:
+        """Row positions of facility_id within range_days.
+
+        Because rows are sorted by time, the precomputed positions of one
+        facility that are at or after the first in-range row are exactly its
+        in-range rows.
+        """
+        positions = state.by_facility.get(sheet_name, {}).get(
+            facility_id, np.empty(0, dtype=np.intp)
+        )
+        start = self._range_start(state, sheet_name, range_days)
+        return positions[np.searchsorted(positions, start) :]
+
+    def _row_selector(
+        self,
+        state: _IndexedSheets,
+        sheet_name: str,
+        range_days: Optional[int],
+        facility_id: Optional[str],
+    ) -> Union[slice, np.ndarray]:
+        """Positional selector for rows within range_days and for facility_id."""
+        if facility_id and sheet_name in state.by_facility:
+            return self._facility_positions(state, sheet_name, range_days, facility_id)
+
+        return slice(self._range_start(state, sheet_name, range_days), None)
+
+    def _select_rows(
+        self,
+        state: _IndexedSheets,
+        sheet_name: str,
+        range_days: Optional[int],
+        facility_id: Optional[str],
     ) -> pd.DataFrame:
-        """Filter dataframe by facility_id if provided."""
-        if facility_id and "facility_id" in df.columns:
-            return df[df["facility_id"] == facility_id]
-        return df
+        """Rows of a sheet within range_days and for facility_id, when given."""
+        df = state.data[sheet_name]
+        return df.iloc[self._row_selector(state, sheet_name, range_days, facility_id)]
+
+    def _category_code(
+        self, state: _IndexedSheets, sheet_name: str, column: str, value: str
+    ) -> Optional[int]:
+        """Categorical code of value in a sheet's column, resolved at load time."""
+        return state.category_codes.get(sheet_name, {}).get(column, {}).get(value)
+
+    def _column_equals(
+        self,
+        state: _IndexedSheets,
+        sheet_name: str,
+        column: str,
+        rows: Union[slice, np.ndarray],
+        value: str,
+    ) -> np.ndarray:
+        """Boolean mask of column == value at rows.
+
+        Categorical columns are compared on their integer codes, so no
+        strings are materialized.
+        """
+        series = state.data[sheet_name][column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = series.cat.codes.to_numpy()[rows]
+            code = self._category_code(state, sheet_name, column, value)
+            if code is None:
+                return np.zeros(len(codes), dtype=bool)
+            return codes == code
+
+        return series.to_numpy()[rows] == value
+
+    def _count_equal(
+        self,
+        state: _IndexedSheets,
+        sheet_name: str,
+        column: str,
+        positions: np.ndarray,
+        value: str,
+    ) -> int:
+        """Count rows at positions whose column equals value."""
+        return np.count_nonzero(
+            self._column_equals(state, sheet_name, column, positions, value)
+        )
+
+    def _column_values(
+        self,
+        state: _IndexedSheets,
+        sheet_name: str,
+        column: str,
+        rows: Union[slice, np.ndarray],
+    ) -> np.ndarray:
+        """Numeric column at rows as float64, NaN marking missing values."""
+        series = state.data[sheet_name][column]
+        return series.to_numpy(dtype=np.float64, na_value=np.nan)[rows]
+
+    @staticmethod
+    def _codes(series: pd.Series) -> Tuple[np.ndarray, pd.Index]:
+        """Integer codes and their labels for a column, -1 marking missing values."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.cat.codes.to_numpy(), series.cat.categories
+        return pd.factorize(series)
+
+    def _facility_groups(
+        self, state: _IndexedSheets, sheet_name: str, rows: Union[slice, np.ndarray]
+    ) -> Tuple[np.ndarray, np.ndarray, pd.Index]:
+        """Facility code of each selected row, the codes with at least one row and their labels.
+
+        Counts per facility are then np.bincount over these codes, which
+        avoids building a pandas groupby for every query. Rows without a
+        facility get code -1 and belong to no group.
+        """
+        codes, labels = self._codes(state.data[sheet_name]["facility_id"])
+        codes = codes[rows]
+        sizes = np.bincount(codes[codes >= 0], minlength=len(labels))
+        return codes, np.flatnonzero(sizes), labels
+
+    @staticmethod
+    def _group_sum(
+        codes: np.ndarray, values: np.ndarray, n_groups: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Per-group sum of the non-missing values and their count."""
+        present = (codes >= 0) & ~np.isnan(values)
+        counts = np.bincount(codes[present], minlength=n_groups)
+        sums = np.bincount(codes[present], weights=values[present], minlength=n_groups)
+        return sums, counts
+
+    @classmethod
+    def _group_mean(
+        cls, codes: np.ndarray, values: np.ndarray, n_groups: int
+    ) -> np.ndarray:
+        """Per-group mean of the non-missing values, NaN for groups without any."""
+        sums, counts = cls._group_sum(codes, values, n_groups)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / counts
+
+    def _format_columns(
+        self, columns: Dict[str, np.ndarray], metadata: Dict, source: str = "excel"
+    ) -> Dict:
+        """Format column arrays as result dict, without an intermediate DataFrame."""
+        values = [np.asarray(column) for column in columns.values()]
+        if not values or not len(values[0]):
+            return self._format_result(_EMPTY_FRAME, metadata, source)
+
+        # Blank out NaN values as _format_result does
+        lists = [
+            (
+                [("" if np.isnan(value) else value) for value in column.tolist()]
+                if column.dtype.kind == "f" and np.isnan(column).any()
+                else column.tolist()
+            )
+            for column in values
+        ]
+
+        return {
+            "columns": list(columns),
+            "rows": [list(row) for row in zip(*lists)],
+            "metadata": {**metadata, "source": source, "rowCount": len(values[0])},
+        }
 
     def _format_result(
         self, df: pd.DataFrame, metadata: Dict, source: str = "excel"
@@ -135,8 +816,10 @@ class ExcelDataSource(TrackmanDataSource):
                 "metadata": {**metadata, "source": source, "rowCount": 0},
             }
 
-        # Convert DataFrame to list of lists, handling NaN values
-        rows = df.fillna("").values.tolist()
+        # Materialize one object array and blank out NaN values in place
+        values = df.to_numpy(dtype=object)
+        values[pd.isna(values)] = ""
+        rows = values.tolist()
 
         return {
             "columns": df.columns.tolist(),
@@ -144,175 +827,241 @@ class ExcelDataSource(TrackmanDataSource):
             "metadata": {**metadata, "source": source, "rowCount": len(df)},
         }
 
+    @_cached_query
     def get_errors_summary(
         self, range_days: int, facility_id: Optional[str] = None
     ) -> Dict:
         """Get summary of errors within the specified time range."""
         try:
-            df = self._data.get("errors", pd.DataFrame())
-            df = self._filter_by_date_range(df, range_days)
-            df = self._filter_by_facility(df, facility_id)
+            state = self._state
+            errors = state.data["errors"]
+            rows = self._row_selector(state, "errors", range_days, facility_id)
 
-            if df.empty:
+            if errors.empty:
                 return self._format_result(
-                    df, {"range_days": range_days, "facility_id": facility_id}
+                    errors, {"range_days": range_days, "facility_id": facility_id}
                 )
 
-            # Group by facility and summarize
-            summary = (
-                df.groupby("facility_id")
-                .agg(
-                    {
-                        "error_code": "count",
-                        "severity": lambda x: (x == "critical").sum(),
-                    }
-                )
-                .reset_index()
+            # Count per facility on the integer codes in a few bincount passes,
+            # reading the selected rows as array views rather than a sub-frame
+            fac_codes, observed, facilities = self._facility_groups(
+                state, "errors", rows
+            )
+            err_codes, error_codes = self._codes(errors["error_code"])
+            err_codes = err_codes[rows]
+            n_groups = len(facilities)
+            has_error = (fac_codes >= 0) & (err_codes >= 0)
+            is_critical = (fac_codes >= 0) & self._column_equals(
+                state, "errors", "severity", rows, "critical"
             )
-            summary.columns = ["facility_id", "error_count", "critical_count"]
 
-            # Add unique error types
-            unique_errors = (
-                df.groupby("facility_id")["error_code"].nunique().reset_index()
+            # Distinct (facility, error code) pairs give the unique errors per facility
+            pairs = np.unique(
+                fac_codes[has_error].astype(np.int64) * len(error_codes)
+                + err_codes[has_error]
             )
-            unique_errors.columns = ["facility_id", "unique_errors"]
-            summary = summary.merge(unique_errors, on="facility_id")
+            summary = {
+                "facility_id": facilities[observed],
+                "error_count": np.bincount(fac_codes[has_error], minlength=n_groups)[
+                    observed
+                ],
+                "critical_count": np.bincount(
+                    fac_codes[is_critical], minlength=n_groups
+                )[observed],
+                "unique_errors": np.bincount(
+                    pairs // max(len(error_codes), 1), minlength=n_groups
+                )[observed],
+            }
 
-            return self._format_result(
+            return self._format_columns(
                 summary, {"range_days": range_days, "facility_id": facility_id}
             )
         except Exception as e:
             logger.error(f"Error in get_errors_summary: {str(e)}")
             raise
 
+    @_cached_query
     def get_top_error_messages(
-        self, range_days: int, limit: int = 10, facility_id: Optional[str] = None
+        self,
+        range_days: int,
+        limit: int = 10,
+        facility_id: Optional[str] = None,
+        approximate: bool = False,
     ) -> Dict:
-        """Get top error messages by frequency."""
+        """Get top error messages by frequency.
+
+        Counts are always exact; approximate is accepted for interface
+        compatibility since in-memory counting is already cheap.
+        """
         try:
-            df = self._data.get("errors", pd.DataFrame())
-            df = self._filter_by_date_range(df, range_days)
-            df = self._filter_by_facility(df, facility_id)
+            state = self._state
+            errors = state.data["errors"]
+            rows = self._row_selector(state, "errors", range_days, facility_id)
+            metadata = {
+                "range_days": range_days,
+                "limit": limit,
+                "facility_id": facility_id,
+            }
 
-            if df.empty:
-                return self._format_result(
-                    df,
-                    {
-                        "range_days": range_days,
-                        "limit": limit,
-                        "facility_id": facility_id,
-                    },
-                )
+            if errors.empty:
+                return self._format_result(errors, metadata)
 
-            # Count error messages and get most severe severity for each
-            error_summary = (
-                df.groupby(["error_message", "error_code"])
-                .agg({"error_code": "size", "severity": "first"})
-                .reset_index()
+            # Group on integer codes: messages are factorized sorted so groups
+            # come out in the same (message, code) order as a sorted groupby
+            msg_codes, messages = pd.factorize(
+                errors["error_message"].iloc[rows], sort=True
             )
-            error_summary.columns = [
-                "error_message",
-                "error_code",
-                "count",
-                "severity",
-            ]
+            err_codes, error_codes = self._codes(errors["error_code"])
+            sev_codes, severities = self._codes(errors["severity"])
+            err_codes, sev_codes = err_codes[rows], sev_codes[rows]
 
-            # Sort by count and limit
-            error_summary = error_summary.sort_values("count", ascending=False).head(
-                limit
+            valid = (msg_codes >= 0) & (err_codes >= 0)
+            keys = (
+                msg_codes[valid].astype(np.int64) * len(error_codes) + err_codes[valid]
+            )
+            groups, inverse, counts = np.unique(
+                keys, return_inverse=True, return_counts=True
             )
 
-            return self._format_result(
-                error_summary,
-                {"range_days": range_days, "limit": limit, "facility_id": facility_id},
+            # Severity of each group's first row that has one
+            group_severity = np.full(len(groups), "", dtype=object)
+            sev_codes = sev_codes[valid]
+            has_severity = sev_codes >= 0
+            with_severity, first = np.unique(inverse[has_severity], return_index=True)
+            group_severity[with_severity] = np.asarray(severities, dtype=object)[
+                sev_codes[has_severity][first]
+            ]
+
+            # Top groups by count in O(n) with argpartition; the position term
+            # breaks ties by group order so the result stays deterministic
+            rank = -counts.astype(np.int64) * len(groups) + np.arange(len(groups))
+            limit = min(max(int(limit), 0), len(groups))
+            top = (
+                np.argpartition(rank, limit - 1)[:limit]
+                if limit
+                else np.empty(0, dtype=np.intp)
             )
+            top = top[np.argsort(rank[top])]
+
+            top_groups = groups[top]
+            summary = {
+                "error_message": np.asarray(messages, dtype=object)[
+                    top_groups // max(len(error_codes), 1)
+                ],
+                "error_code": np.asarray(error_codes, dtype=object)[
+                    top_groups % max(len(error_codes), 1)
+                ],
+                "count": counts[top],
+                "severity": group_severity[top],
+            }
+
+            return self._format_columns(summary, metadata)
         except Exception as e:
             logger.error(f"Error in get_top_error_messages: {str(e)}")
             raise
 
+    @_cached_query
     def get_connectivity_summary(
         self, range_days: int, facility_id: Optional[str] = None
     ) -> Dict:
         """Get connectivity status summary."""
         try:
-            df = self._data.get("connectivity", pd.DataFrame())
-            df = self._filter_by_date_range(df, range_days)
-            df = self._filter_by_facility(df, facility_id)
+            state = self._state
+            connectivity = state.data["connectivity"]
+            rows = self._row_selector(state, "connectivity", range_days, facility_id)
 
-            if df.empty:
+            if connectivity.empty:
                 return self._format_result(
-                    df, {"range_days": range_days, "facility_id": facility_id}
+                    connectivity, {"range_days": range_days, "facility_id": facility_id}
                 )
 
             # Calculate connectivity metrics per facility
-            summary = df.groupby("facility_id").agg(
-                total_events=("connectivity_status", "size"),
-                connected_count=(
-                    "connectivity_status",
-                    lambda x: (x == "connected").sum(),
-                ),
+            fac_codes, observed, facilities = self._facility_groups(
+                state, "connectivity", rows
             )
+            is_connected = (fac_codes >= 0) & self._column_equals(
+                state, "connectivity", "connectivity_status", rows, "connected"
+            )
+            total_events = np.bincount(
+                fac_codes[fac_codes >= 0], minlength=len(facilities)
+            )[observed]
+            connected_count = np.bincount(
+                fac_codes[is_connected], minlength=len(facilities)
+            )[observed]
+
+            summary = {
+                "facility_id": facilities[observed],
+                "total_events": total_events,
+                "connected_count": connected_count,
+                "connected_pct": (connected_count / total_events * 100).round(2),
+            }
 
-            summary["connected_pct"] = (
-                summary["connected_count"] / summary["total_events"] * 100
-            ).round(2)
-            summary = summary.reset_index()
-
-            return self._format_result(
+            return self._format_columns(
                 summary, {"range_days": range_days, "facility_id": facility_id}
             )
         except Exception as e:
             logger.error(f"Error in get_connectivity_summary: {str(e)}")
             raise
 
+    @_cached_query
     def get_disconnect_reasons(
         self, range_days: int, facility_id: Optional[str] = None
     ) -> Dict:
         """Get disconnect reasons breakdown."""
         try:
-            df = self._data.get("connectivity", pd.DataFrame())
-            df = self._filter_by_date_range(df, range_days)
-            df = self._filter_by_facility(df, facility_id)
+            state = self._state
+            connectivity = state.data["connectivity"]
+            rows = self._row_selector(state, "connectivity", range_days, facility_id)
 
-            if df.empty:
+            if connectivity.empty:
                 return self._format_result(
-                    df, {"range_days": range_days, "facility_id": facility_id}
+                    connectivity, {"range_days": range_days, "facility_id": facility_id}
                 )
 
-            # Filter for disconnected events only
-            disconnected = df[df["connectivity_status"] == "disconnected"]
+            # Count reasons of disconnected events on the categorical codes
+            status_codes, statuses = self._codes(connectivity["connectivity_status"])
+            reason_codes, reasons_index = self._codes(connectivity["disconnect_reason"])
+            status_codes, reason_codes = status_codes[rows], reason_codes[rows]
+            disconnected_code = statuses.get_indexer(["disconnected"])[0]
+            selected = reason_codes[
+                (status_codes == disconnected_code) & (status_codes >= 0)
+            ]
+            codes, counts = np.unique(selected[selected >= 0], return_counts=True)
 
-            if disconnected.empty:
+            if not len(codes):
                 return self._format_result(
-                    disconnected, {"range_days": range_days, "facility_id": facility_id}
+                    _EMPTY_FRAME, {"range_days": range_days, "facility_id": facility_id}
                 )
 
-            # Count disconnect reasons
-            reasons = disconnected["disconnect_reason"].value_counts().reset_index()
-            reasons.columns = ["disconnect_reason", "count"]
-
-            # Calculate percentage
-            total = reasons["count"].sum()
-            reasons["percentage"] = (reasons["count"] / total * 100).round(2)
+            order = np.argsort(-counts, kind="stable")
+            counts = counts[order]
+            reasons = {
+                "disconnect_reason": reasons_index[codes[order]],
+                "count": counts,
+                "percentage": (counts / counts.sum() * 100).round(2),
+            }
 
-            return self._format_result(
+            return self._format_columns(
                 reasons, {"range_days": range_days, "facility_id": facility_id}
             )
         except Exception as e:
             logger.error(f"Error in get_disconnect_reasons: {str(e)}")
             raise
 
+    @_cached_query
     def get_facility_summary(self, facility_id: str, range_days: int) -> Dict:
         """Get comprehensive summary for a specific facility."""
         try:
+            state = self._state
             # Get facility metadata
-            metadata_df = self._data.get("facility_metadata", pd.DataFrame())
-            facility_meta = metadata_df[metadata_df["facility_id"] == facility_id]
+            facility_meta = self._select_rows(
+                state, "facility_metadata", None, facility_id
+            )
 
             if facility_meta.empty:
                 logger.warning(f"No metadata found for facility {facility_id}")
                 return self._format_result(
-                    pd.DataFrame(),
+                    _EMPTY_FRAME,
                     {"facility_id": facility_id, "range_days": range_days},
                 )
 
@@ -324,47 +1073,44 @@ class ExcelDataSource(TrackmanDataSource):
                 if col != "facility_id":
                     metrics.append([col, str(facility_meta[col].iloc[0])])
 
-            # Add error metrics
-            errors_df = self._data.get("errors", pd.DataFrame())
-            errors_filtered = self._filter_by_date_range(errors_df, range_days)
-            errors_filtered = errors_filtered[
-                errors_filtered["facility_id"] == facility_id
-            ]
+            # Compute the remaining metrics straight from the facility's row
+            # positions, without building an intermediate frame per sheet
+            error_rows = self._facility_positions(
+                state, "errors", range_days, facility_id
+            )
 
-            if not errors_filtered.empty:
-                metrics.append(["errors_total", len(errors_filtered)])
+            if len(error_rows):
+                metrics.append(["errors_total", len(error_rows)])
                 metrics.append(
                     [
                         "errors_critical",
-                        (errors_filtered["severity"] == "critical").sum(),
+                        self._count_equal(
+                            state, "errors", "severity", error_rows, "critical"
+                        ),
                     ]
                 )
 
-            # Add connectivity metrics
-            conn_df = self._data.get("connectivity", pd.DataFrame())
-            conn_filtered = self._filter_by_date_range(conn_df, range_days)
-            conn_filtered = conn_filtered[conn_filtered["facility_id"] == facility_id]
+            conn_rows = self._facility_positions(
+                state, "connectivity", range_days, facility_id
+            )
 
-            if not conn_filtered.empty:
-                connected_pct = (
-                    (conn_filtered["connectivity_status"] == "connected").sum()
-                    / len(conn_filtered)
-                    * 100
+            if len(conn_rows):
+                connected = self._count_equal(
+                    state, "connectivity", "connectivity_status", conn_rows, "connected"
                 )
+                connected_pct = connected / len(conn_rows) * 100
                 metrics.append(["connectivity_pct", round(connected_pct, 2)])
 
-            # Add data quality metrics
-            quality_df = self._data.get("data_quality", pd.DataFrame())
-            quality_filtered = self._filter_by_date_range(quality_df, range_days)
-            quality_filtered = quality_filtered[
-                quality_filtered["facility_id"] == facility_id
-            ]
+            quality_rows = self._facility_positions(
+                state, "data_quality", range_days, facility_id
+            )
 
-            if not quality_filtered.empty:
+            if len(quality_rows):
+                quality_scores = state.data["data_quality"]["data_quality_score"]
                 metrics.append(
                     [
                         "avg_data_quality_score",
-                        round(quality_filtered["data_quality_score"].mean(), 2),
+                        round(quality_scores.take(quality_rows).mean(), 2),
                     ]
                 )
 
@@ -377,45 +1123,51 @@ class ExcelDataSource(TrackmanDataSource):
             logger.error(f"Error in get_facility_summary: {str(e)}")
             raise
 
+    @_cached_query
     def get_data_quality_summary(
         self, range_days: int, facility_id: Optional[str] = None
     ) -> Dict:
         """Get data quality metrics summary."""
         try:
-            df = self._data.get("data_quality", pd.DataFrame())
-            df = self._filter_by_date_range(df, range_days)
-            df = self._filter_by_facility(df, facility_id)
+            state = self._state
+            quality = state.data["data_quality"]
+            rows = self._row_selector(state, "data_quality", range_days, facility_id)
 
-            if df.empty:
+            if quality.empty:
                 return self._format_result(
-                    df, {"range_days": range_days, "facility_id": facility_id}
+                    quality, {"range_days": range_days, "facility_id": facility_id}
                 )
 
             # Calculate quality metrics per facility
-            summary = (
-                df.groupby("facility_id")
-                .agg(
-                    {
-                        "data_quality_score": "mean",
-                        "missing_records": "sum",
-                        "latency_ms": "mean",
-                    }
-                )
-                .reset_index()
+            fac_codes, observed, facilities = self._facility_groups(
+                state, "data_quality", rows
             )
+            n_groups = len(facilities)
+            missing = self._column_values(
+                state, "data_quality", "missing_records", rows
+            )
+            total_missing = self._group_sum(fac_codes, missing, n_groups)[0][observed]
+            if pd.api.types.is_integer_dtype(quality["missing_records"].dtype):
+                total_missing = total_missing.astype(np.int64)
+
+            summary = {
+                "facility_id": facilities[observed],
+                "avg_quality_score": self._group_mean(
+                    fac_codes,
+                    self._column_values(
+                        state, "data_quality", "data_quality_score", rows
+                    ),
+                    n_groups,
+                )[observed].round(2),
+                "total_missing_records": total_missing,
+                "avg_latency_ms": self._group_mean(
+                    fac_codes,
+                    self._column_values(state, "data_quality", "latency_ms", rows),
+                    n_groups,
+                )[observed].round(2),
+            }
 
-            summary.columns = [
-                "facility_id",
-                "avg_quality_score",
-                "total_missing_records",
-                "avg_latency_ms",
-            ]
-
-            # Round decimals
-            summary["avg_quality_score"] = summary["avg_quality_score"].round(2)
-            summary["avg_latency_ms"] = summary["avg_latency_ms"].round(2)
-
-            return self._format_result(
+            return self._format_columns(
                 summary, {"range_days": range_days, "facility_id": facility_id}
             )
         except Exception as e:
@@ -1,4 +1,52 @@
-"""Configuration for Redshift table and column allowlists."""
+"""Configuration for Redshift connection settings and table and column allowlists."""
+
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RedshiftConfig:
+    """Redshift connection settings, read from REDSHIFT_* environment variables."""
+
+    host: str
+    database: str
+    user: str
+    password: str
+    port: str = "5439"
+    schema: str = "public"
+    pool_min: int = 1
+    pool_max: int = 8
+    topk_sample_pct: float = 10.0
+    prepare_statements: bool = True
+
+    @classmethod
+    def from_env(cls) -> "RedshiftConfig":
+        """Read settings from the environment, raising if any required one is missing."""
+        host = os.getenv("REDSHIFT_HOST")
+        database = os.getenv("REDSHIFT_DB")
+        user = os.getenv("REDSHIFT_USER")
+        password = os.getenv("REDSHIFT_PASSWORD")
+        if not all([host, database, user, password]):
+            raise ValueError(
+                "Missing required Redshift environment variables: "
+                "REDSHIFT_HOST, REDSHIFT_DB, REDSHIFT_USER, REDSHIFT_PASSWORD"
+            )
+
+        return cls(
+            host=host,
+            database=database,
+            user=user,
+            password=password,
+            port=os.getenv("REDSHIFT_PORT", "5439"),
+            schema=os.getenv("REDSHIFT_SCHEMA", "public"),
+            pool_min=int(os.getenv("REDSHIFT_POOL_MIN", "1")),
+            pool_max=int(os.getenv("REDSHIFT_POOL_MAX", "8")),
+            topk_sample_pct=float(os.getenv("REDSHIFT_TOPK_SAMPLE_PCT", "10")),
+            prepare_statements=(
+                os.getenv("REDSHIFT_PREPARE_STATEMENTS", "true").lower() == "true"
+            ),
+        )
+
 
 # Allowlist configuration for POC
 # Only these tables and columns can be queried
@@ -39,21 +87,22 @@ ALLOWED_TABLES = {
     ],
 }
 
+# Frozen once at import so validation never rebuilds the allowlist sets
+_ALLOWED_SETS = {table: frozenset(columns) for table, columns in ALLOWED_TABLES.items()}
+
 
 def validate_table(table_name: str) -> bool:
     """Validate that table is in allowlist."""
-    return table_name in ALLOWED_TABLES
+    return table_name in _ALLOWED_SETS
 
 
 def validate_columns(table_name: str, columns: list) -> bool:
     """Validate that all columns are in allowlist for the table."""
-    if table_name not in ALLOWED_TABLES:
+    allowed = _ALLOWED_SETS.get(table_name)
+    if allowed is None:
         return False
 
-    allowed = set(ALLOWED_TABLES[table_name])
-    requested = set(columns)
-
-    return requested.issubset(allowed)
+    return allowed.issuperset(columns)
 
 
 def get_allowed_columns(table_name: str) -> list:
@@ -1,53 +1,345 @@
 """Redshift-based Trackman data source implementation."""
 
+import itertools
 import logging
-import os
-from datetime import datetime, timedelta
-from typing import Dict, Optional, Any, List
+import re
+import threading
+from typing import Dict, Optional, Any, List, Tuple
 
 import psycopg2
+import psycopg2.extensions
+import psycopg2.pool
 from psycopg2 import sql
 
 from .data_source_interface import TrackmanDataSource
-from .redshift_config import validate_table, get_allowed_columns
+from .redshift_config import RedshiftConfig, validate_table, get_allowed_columns
 
 logger = logging.getLogger(__name__)
 
+# facility_metadata columns reported by get_facility_summary, in select order
+FACILITY_METADATA_METRICS = (
+    "location",
+    "opening_hours",
+    "subscription_status",
+    "units_deployed",
+    "usage_hours_30d",
+    "strokes_tracked",
+    "tournaments_hosted",
+)
+
+# SQL types PREPARE declares for the parameters of QUERY_TEMPLATES: (range_days,
+# facility_id, facility_id). Declared per template rather than taken from the
+# first call's values, so every later call on the connection binds the same types
+FACILITY_PARAM_TYPES = ("INTEGER", "VARCHAR", "VARCHAR")
+
+# Tables read by this source, checked against the allowlist once at init
+_USED_TABLES = ("errors", "connectivity", "facility_metadata", "data_quality")
+
+# Query templates by name as (table, SQL), composed once per source. Every
+# template takes (range_days, facility_id, facility_id) first; a NULL facility_id
+# disables the facility filter so one statement serves both cases
+QUERY_TEMPLATES = {
+    "errors_summary": (
+        "errors",
+        """
+        SELECT
+            facility_id,
+            COUNT(*) as error_count,
+            SUM(CASE WHEN severity = 'critical' THEN 1 ELSE 0 END) as critical_count,
+            COUNT(DISTINCT error_code) as unique_errors
+        FROM {schema}.{table}
+        WHERE timestamp >= DATEADD(day, -%s, GETDATE())
+            AND (CAST(%s AS VARCHAR) IS NULL OR facility_id = %s)
+        GROUP BY facility_id
+        """,
+    ),
+    "top_error_messages": (
+        "errors",
+        """
+        SELECT
+            error_message,
+            error_code,
+            {count} as count,
+            MAX(severity) as severity
+        FROM {schema}.{table}
+        WHERE timestamp >= DATEADD(day, -%s, GETDATE())
+            AND (CAST(%s AS VARCHAR) IS NULL OR facility_id = %s){sample_filter}
+        GROUP BY error_message, error_code
+        ORDER BY count DESC
+        LIMIT %s
+        """,
+    ),
+    "connectivity_summary": (
+        "connectivity",
+        """
+        SELECT
+            facility_id,
+            COUNT(*) as total_events,
+            SUM(CASE WHEN connectivity_status = 'connected' THEN 1 ELSE 0 END) as connected_count,
+            ROUND(100.0 * SUM(CASE WHEN connectivity_status = 'connected' THEN 1 ELSE 0 END) / COUNT(*), 2) as connected_pct
+        FROM {schema}.{table}
+        WHERE timestamp >= DATEADD(day, -%s, GETDATE())
+            AND (CAST(%s AS VARCHAR) IS NULL OR facility_id = %s)
+        GROUP BY facility_id
+        """,
+    ),
+    "disconnect_reasons": (
+        "connectivity",
+        """
+        SELECT
+            disconnect_reason,
+            COUNT(*) as count,
+            ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 2) as percentage
+        FROM {schema}.{table}
+        WHERE timestamp >= DATEADD(day, -%s, GETDATE())
+            AND connectivity_status = 'disconnected'
+            AND (CAST(%s AS VARCHAR) IS NULL OR facility_id = %s)
+        GROUP BY disconnect_reason
+        ORDER BY count DESC
+        """,
+    ),
+    "data_quality_summary": (
+        "data_quality",
+        """
+        SELECT
+            facility_id,
+            ROUND(AVG(data_quality_score), 2) as avg_quality_score,
+            SUM(missing_records) as total_missing_records,
+            ROUND(AVG(latency_ms), 2) as avg_latency_ms
+        FROM {schema}.{table}
+        WHERE timestamp >= DATEADD(day, -%s, GETDATE())
+            AND (CAST(%s AS VARCHAR) IS NULL OR facility_id = %s)
+        GROUP BY facility_id
+        """,
+    ),
+}
+
+# facility_summary in one statement: the error counts for the range, always
+# one row, joined to the facility's metadata row when there is one
+FACILITY_SUMMARY_QUERY = """
+    SELECT
+        CAST(e.errors_total AS VARCHAR),
+        CAST(e.errors_critical AS VARCHAR),
+        m.facility_id,
+        m.location,
+        m.opening_hours,
+        m.subscription_status,
+        CAST(m.units_deployed AS VARCHAR),
+        CAST(m.usage_hours_30d AS VARCHAR),
+        CAST(m.strokes_tracked AS VARCHAR),
+        CAST(m.tournaments_hosted AS VARCHAR)
+    FROM (
+        SELECT
+            COUNT(*) as errors_total,
+            SUM(CASE WHEN severity = 'critical' THEN 1 ELSE 0 END) as errors_critical
+        FROM {schema}.{errors}
+        WHERE facility_id = %s AND timestamp >= DATEADD(day, -%s, GETDATE())
+    ) e
+    LEFT JOIN (
+        SELECT
+            facility_id,
+            location,
+            opening_hours,
+            subscription_status,
+            units_deployed,
+            usage_hours_30d,
+            strokes_tracked,
+            tournaments_hosted
+        FROM {schema}.{facility_metadata}
+        WHERE facility_id = %s
+    ) m ON 1 = 1
+"""
+
+# Parameter types of FACILITY_SUMMARY_QUERY: (facility_id, range_days, facility_id)
+FACILITY_SUMMARY_PARAM_TYPES = ("VARCHAR", "INTEGER", "VARCHAR")
+
+
+def _numbered_placeholders(template: str) -> str:
+    """Rewrite %s placeholders as the $1, $2, ... parameters PREPARE expects."""
+    numbers = itertools.count(1)
+    return re.sub("%s", lambda _: f"${next(numbers)}", template)
+
+
+class _PreparingConnection(psycopg2.extensions.connection):
+    """Connection remembering which statements are prepared in its session."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared_statements = set()
+
 
 class RedshiftDataSource(TrackmanDataSource):
     """Redshift-based implementation of Trackman data source."""
 
-    def __init__(self):
-        """Initialize Redshift data source using environment variables."""
-        self.host = os.getenv("REDSHIFT_HOST")
-        self.port = os.getenv("REDSHIFT_PORT", "5439")
-        self.database = os.getenv("REDSHIFT_DB")
-        self.user = os.getenv("REDSHIFT_USER")
-        self.password = os.getenv("REDSHIFT_PASSWORD")
-        self.schema = os.getenv("REDSHIFT_SCHEMA", "public")
-
-        if not all([self.host, self.database, self.user, self.password]):
-            raise ValueError(
-                "Missing required Redshift environment variables: "
-                "REDSHIFT_HOST, REDSHIFT_DB, REDSHIFT_USER, REDSHIFT_PASSWORD"
-            )
+    def __init__(self, config: Optional[RedshiftConfig] = None):
+        """Initialize Redshift data source, reading config from the environment by default."""
+        self.config = config or RedshiftConfig.from_env()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+        # getconn() raises PoolError once pool_max connections are checked
+        # out, so callers wait here for a free connection instead
+        self._connection_slots = threading.BoundedSemaphore(self.config.pool_max)
+        for table in _USED_TABLES:
+            self._validate_table_access(table)
+        self._tables = {table: sql.Identifier(table) for table in _USED_TABLES}
+        self._queries, self._statements = self._compose_queries()
 
         logger.info(
-            f"Initialized Redshift data source: {self.user}@{self.host}:{self.port}/{self.database}"
+            f"Initialized Redshift data source: {self.config.user}@{self.config.host}:{self.config.port}/{self.config.database}"
         )
 
-    def _get_connection(self):
-        """Create a connection to Redshift."""
-        return psycopg2.connect(
-            host=self.host,
-            port=self.port,
-            database=self.database,
-            user=self.user,
-            password=self.password,
+    @property
+    def max_concurrent_queries(self) -> int:
+        """Pooled connections available; further queries wait for a free one."""
+        return self.config.pool_max
+
+    def _compose_queries(
+        self,
+    ) -> Tuple[
+        Dict[str, sql.Composed], Dict[str, Tuple[str, sql.Composed, sql.Composed]]
+    ]:
+        """Compose every query once for the configured schema.
+
+        The sampled top errors query is stored as "top_error_messages_approx".
+        Alongside each query, the prepared statement form is composed as its
+        name, the PREPARE with declared parameter types and the EXECUTE that
+        runs it.
+        Queries with a bound LIMIT are not prepared, keeping LIMIT a literal
+        interpolated client-side.
+        """
+        schema = sql.Identifier(self.config.schema)
+        variants = {name: (sql.SQL("COUNT(*)"), "") for name in QUERY_TEMPLATES}
+        if 0 < self.config.topk_sample_pct < 100:
+            # Aggregate a random sample and scale the counts back up. Every
+            # row in range is still scanned to draw the sample
+            variants["top_error_messages_approx"] = (
+                sql.SQL("CAST(ROUND(COUNT(*) * {scale}) AS BIGINT)").format(
+                    scale=sql.Literal(100 / self.config.topk_sample_pct)
+                ),
+                " AND RANDOM() < %s",
+            )
+
+        templates = {}
+        for name, (count, sample_filter) in variants.items():
+            table, template = QUERY_TEMPLATES[name.replace("_approx", "")]
+            templates[name] = (
+                template.replace("{sample_filter}", sample_filter),
+                {"schema": schema, "table": self._tables[table], "count": count},
+                FACILITY_PARAM_TYPES,
+            )
+        templates["facility_summary"] = (
+            FACILITY_SUMMARY_QUERY,
+            {
+                "schema": schema,
+                "errors": self._tables["errors"],
+                "facility_metadata": self._tables["facility_metadata"],
+            },
+            FACILITY_SUMMARY_PARAM_TYPES,
+        )
+
+        queries, statements = {}, {}
+        for name, (template, parts, param_types) in templates.items():
+            queries[name] = sql.SQL(template).format(**parts)
+            if "LIMIT %s" in template:
+                continue
+            if template.count("%s") != len(param_types):
+                raise ValueError(
+                    f"Query '{name}' does not declare a type for each parameter"
+                )
+            statement = sql.Identifier(f"trackman_{name}")
+            statements[name] = (
+                f"trackman_{name}",
+                sql.SQL("PREPARE {} ({}) AS {}").format(
+                    statement,
+                    sql.SQL(", ").join(map(sql.SQL, param_types)),
+                    sql.SQL(_numbered_placeholders(template)).format(**parts),
+                ),
+                sql.SQL("EXECUTE {} ({})").format(
+                    statement,
+                    sql.SQL(", ").join([sql.Placeholder()] * len(param_types)),
+                ),
+            )
+        return queries, statements
+
+    def _facility_params(self, range_days: int, facility_id: Optional[str]) -> tuple:
+        """Date range and facility parameters taken by every query template."""
+        facility_id = facility_id or None
+        return (int(range_days), facility_id, facility_id)
+
+    def _get_pool(self) -> psycopg2.pool.ThreadedConnectionPool:
+        """Create the connection pool on first use."""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = psycopg2.pool.ThreadedConnectionPool(
+                        self.config.pool_min,
+                        self.config.pool_max,
+                        host=self.config.host,
+                        port=self.config.port,
+                        database=self.config.database,
+                        user=self.config.user,
+                        password=self.config.password,
+                        connection_factory=(
+                            _PreparingConnection
+                            if self.config.prepare_statements
+                            else None
+                        ),
+                        # Keep idle pooled sockets alive through Redshift's idle timeout
+                        keepalives=1,
+                        keepalives_idle=30,
+                        keepalives_interval=10,
+                        keepalives_count=3,
+                    )
+        return self._pool
+
+    def _get_connection(self) -> Tuple[psycopg2.pool.ThreadedConnectionPool, Any]:
+        """Borrow a connection to Redshift, along with the pool it came from.
+
+        Blocks while pool_max connections are checked out.
+        """
+        self._connection_slots.acquire()
+        try:
+            pool = self._get_pool()
+            return pool, pool.getconn()
+        except BaseException:
+            self._connection_slots.release()
+            raise
+
+    def _release_connection(
+        self, pool: psycopg2.pool.ThreadedConnectionPool, conn, broken: bool = False
+    ):
+        """Return a connection to the pool it was borrowed from, discarding it if it is broken.
+
+        close() may have closed that pool meanwhile; closeall() has then
+        already closed the connection, so there is nothing to return.
+        """
+        try:
+            pool.putconn(conn, close=broken)
+        except psycopg2.pool.PoolError:
+            if not pool.closed:
+                raise
+            conn.close()
+        finally:
+            self._connection_slots.release()
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+    def _run_query(self, name: str, params: tuple) -> Dict:
+        """Execute a composed query by name, as a prepared statement when enabled."""
+        return self._execute_query(
+            self._queries[name], params, self._statements.get(name)
         )
 
     def _execute_query(
-        self, query: sql.SQL, params: tuple = None
+        self,
+        query: sql.SQL,
+        params: tuple = None,
+        statement: Optional[Tuple[str, sql.Composed, sql.Composed]] = None,
     ) -> List[List[Any]]:
         """
         Execute a parameterized query safely.
@@ -55,27 +347,55 @@ class RedshiftDataSource(TrackmanDataSource):
         Args:
             query: sql.SQL composed query object
             params: Query parameters
+            statement: Prepared statement form of the query, used on
+                connections that track their prepared statements
 
         Returns:
             List of rows
         """
-        conn = None
+        pool = conn = None
+        broken = uses_prepared = False
         try:
-            conn = self._get_connection()
+            pool, conn = self._get_connection()
+            prepared = getattr(conn, "prepared_statements", None)
             with conn.cursor() as cur:
-                if params:
+                if statement and params and prepared is not None:
+                    # Prepare once per session so Redshift parses and plans
+                    # the statement once; prepared statements outlive rollbacks
+                    uses_prepared = True
+                    name, prepare, execute = statement
+                    if name not in prepared:
+                        cur.execute(prepare)
+                        prepared.add(name)
+                    cur.execute(execute, params)
+                elif params:
                     cur.execute(query, params)
                 else:
                     cur.execute(query)
+                # Every query is an aggregate bounded by facility count or
+                # LIMIT, so one client-side fetch beats a named (server-side)
+                # cursor, which Redshift materializes on the leader node and
+                # which costs a round trip per batch
                 rows = cur.fetchall()
                 columns = [desc[0] for desc in cur.description]
-                return {"columns": columns, "rows": rows}
+            # End the read transaction so the connection goes back idle
+            conn.rollback()
+            return {"columns": columns, "rows": rows}
         except Exception as e:
             logger.error(f"Error executing query: {str(e)}")
+            # After a failed PREPARE or EXECUTE the session's statements may
+            # no longer match prepared_statements, so the connection is
+            # discarded rather than reused
+            broken = uses_prepared
+            if conn:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    broken = True
             raise
         finally:
             if conn:
-                conn.close()
+                self._release_connection(pool, conn, broken=broken)
 
     def _validate_table_access(self, table_name: str):
         """Validate table is in allowlist."""
@@ -96,56 +416,13 @@ class RedshiftDataSource(TrackmanDataSource):
             },
         }
 
-    def _get_date_filter(self, range_days: int) -> datetime:
-        """Get cutoff datetime for date filtering."""
-        return datetime.now() - timedelta(days=range_days)
-
     def get_errors_summary(
         self, range_days: int, facility_id: Optional[str] = None
     ) -> Dict:
         """Get summary of errors within the specified time range."""
         try:
-            self._validate_table_access("errors")
-
-            # Build parameterized query
-            cutoff_date = self._get_date_filter(range_days)
-
-            if facility_id:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        facility_id,
-                        COUNT(*) as error_count,
-                        SUM(CASE WHEN severity = 'critical' THEN 1 ELSE 0 END) as critical_count,
-                        COUNT(DISTINCT error_code) as unique_errors
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s AND facility_id = %s
-                    GROUP BY facility_id
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("errors"),
-                )
-                params = (cutoff_date, facility_id)
-            else:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        facility_id,
-                        COUNT(*) as error_count,
-                        SUM(CASE WHEN severity = 'critical' THEN 1 ELSE 0 END) as critical_count,
-                        COUNT(DISTINCT error_code) as unique_errors
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s
-                    GROUP BY facility_id
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("errors"),
-                )
-                params = (cutoff_date,)
-
-            result = self._execute_query(query, params)
+            params = self._facility_params(range_days, facility_id)
+            result = self._run_query("errors_summary", params)
             return self._format_result(
                 result, {"range_days": range_days, "facility_id": facility_id}
             )
@@ -154,58 +431,38 @@ class RedshiftDataSource(TrackmanDataSource):
             raise
 
     def get_top_error_messages(
-        self, range_days: int, limit: int = 10, facility_id: Optional[str] = None
+        self,
+        range_days: int,
+        limit: int = 10,
+        facility_id: Optional[str] = None,
+        approximate: bool = False,
     ) -> Dict:
-        """Get top error messages by frequency."""
+        """Get top error messages by frequency.
+
+        With approximate, a random REDSHIFT_TOPK_SAMPLE_PCT percent of the
+        rows is aggregated and the counts are scaled back up. The counts are
+        estimates that change from call to call. The RANDOM() filter still
+        reads every row in the range, so only the grouping shrinks and the
+        query is not guaranteed to be faster.
+        """
         try:
-            self._validate_table_access("errors")
-
-            cutoff_date = self._get_date_filter(range_days)
-
-            if facility_id:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        error_message,
-                        error_code,
-                        COUNT(*) as count,
-                        MAX(severity) as severity
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s AND facility_id = %s
-                    GROUP BY error_message, error_code
-                    ORDER BY count DESC
-                    LIMIT %s
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("errors"),
-                )
-                params = (cutoff_date, facility_id, limit)
+            metadata = {
+                "range_days": range_days,
+                "limit": limit,
+                "facility_id": facility_id,
+            }
+
+            params = self._facility_params(range_days, facility_id)
+            if approximate and "top_error_messages_approx" in self._queries:
+                name = "top_error_messages_approx"
+                params += (self.config.topk_sample_pct / 100, int(limit))
+                metadata["sample_pct"] = self.config.topk_sample_pct
             else:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        error_message,
-                        error_code,
-                        COUNT(*) as count,
-                        MAX(severity) as severity
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s
-                    GROUP BY error_message, error_code
-                    ORDER BY count DESC
-                    LIMIT %s
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("errors"),
-                )
-                params = (cutoff_date, limit)
+                name = "top_error_messages"
+                params += (int(limit),)
 
-            result = self._execute_query(query, params)
-            return self._format_result(
-                result,
-                {"range_days": range_days, "limit": limit, "facility_id": facility_id},
-            )
+            result = self._run_query(name, params)
+            return self._format_result(result, metadata)
         except Exception as e:
             logger.error(f"Error in get_top_error_messages: {str(e)}")
             raise
@@ -215,46 +472,8 @@ class RedshiftDataSource(TrackmanDataSource):
     ) -> Dict:
         """Get connectivity status summary."""
         try:
-            self._validate_table_access("connectivity")
-
-            cutoff_date = self._get_date_filter(range_days)
-
-            if facility_id:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        facility_id,
-                        COUNT(*) as total_events,
-                        SUM(CASE WHEN connectivity_status = 'connected' THEN 1 ELSE 0 END) as connected_count,
-                        ROUND(100.0 * SUM(CASE WHEN connectivity_status = 'connected' THEN 1 ELSE 0 END) / COUNT(*), 2) as connected_pct
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s AND facility_id = %s
-                    GROUP BY facility_id
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("connectivity"),
-                )
-                params = (cutoff_date, facility_id)
-            else:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        facility_id,
-                        COUNT(*) as total_events,
-                        SUM(CASE WHEN connectivity_status = 'connected' THEN 1 ELSE 0 END) as connected_count,
-                        ROUND(100.0 * SUM(CASE WHEN connectivity_status = 'connected' THEN 1 ELSE 0 END) / COUNT(*), 2) as connected_pct
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s
-                    GROUP BY facility_id
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("connectivity"),
-                )
-                params = (cutoff_date,)
-
-            result = self._execute_query(query, params)
+            params = self._facility_params(range_days, facility_id)
+            result = self._run_query("connectivity_summary", params)
             return self._format_result(
                 result, {"range_days": range_days, "facility_id": facility_id}
             )
@@ -267,49 +486,8 @@ class RedshiftDataSource(TrackmanDataSource):
     ) -> Dict:
         """Get disconnect reasons breakdown."""
         try:
-            self._validate_table_access("connectivity")
-
-            cutoff_date = self._get_date_filter(range_days)
-
-            if facility_id:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        disconnect_reason,
-                        COUNT(*) as count,
-                        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 2) as percentage
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s
-                        AND connectivity_status = 'disconnected'
-                        AND facility_id = %s
-                    GROUP BY disconnect_reason
-                    ORDER BY count DESC
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("connectivity"),
-                )
-                params = (cutoff_date, facility_id)
-            else:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        disconnect_reason,
-                        COUNT(*) as count,
-                        ROUND(100.0 * COUNT(*) / SUM(COUNT(*)) OVER (), 2) as percentage
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s
-                        AND connectivity_status = 'disconnected'
-                    GROUP BY disconnect_reason
-                    ORDER BY count DESC
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("connectivity"),
-                )
-                params = (cutoff_date,)
-
-            result = self._execute_query(query, params)
+            params = self._facility_params(range_days, facility_id)
+            result = self._run_query("disconnect_reasons", params)
             return self._format_result(
                 result, {"range_days": range_days, "facility_id": facility_id}
             )
@@ -320,64 +498,19 @@ class RedshiftDataSource(TrackmanDataSource):
     def get_facility_summary(self, facility_id: str, range_days: int) -> Dict:
         """Get comprehensive summary for a specific facility."""
         try:
-            self._validate_table_access("facility_metadata")
-
-            # Get facility metadata
-            meta_query = sql.SQL(
-                """
-                SELECT
-                    'location' as metric, location as value FROM {schema}.facility_metadata WHERE facility_id = %s
-                UNION ALL
-                SELECT
-                    'opening_hours', opening_hours FROM {schema}.facility_metadata WHERE facility_id = %s
-                UNION ALL
-                SELECT
-                    'subscription_status', subscription_status FROM {schema}.facility_metadata WHERE facility_id = %s
-                UNION ALL
-                SELECT
-                    'units_deployed', CAST(units_deployed AS VARCHAR) FROM {schema}.facility_metadata WHERE facility_id = %s
-                UNION ALL
-                SELECT
-                    'usage_hours_30d', CAST(usage_hours_30d AS VARCHAR) FROM {schema}.facility_metadata WHERE facility_id = %s
-                UNION ALL
-                SELECT
-                    'strokes_tracked', CAST(strokes_tracked AS VARCHAR) FROM {schema}.facility_metadata WHERE facility_id = %s
-                UNION ALL
-                SELECT
-                    'tournaments_hosted', CAST(tournaments_hosted AS VARCHAR) FROM {schema}.facility_metadata WHERE facility_id = %s
-                """
-            ).format(schema=sql.Identifier(self.schema))
-
-            params = (facility_id,) * 7
-            result = self._execute_query(meta_query, params)
-
-            # Add recent metrics
-            cutoff_date = self._get_date_filter(range_days)
-
-            # Errors count
-            self._validate_table_access("errors")
-            error_query = sql.SQL(
-                """
-                SELECT
-                    'errors_total' as metric,
-                    CAST(COUNT(*) AS VARCHAR) as value
-                FROM {schema}.errors
-                WHERE facility_id = %s AND timestamp >= %s
-                UNION ALL
-                SELECT
-                    'errors_critical',
-                    CAST(SUM(CASE WHEN severity = 'critical' THEN 1 ELSE 0 END) AS VARCHAR)
-                FROM {schema}.errors
-                WHERE facility_id = %s AND timestamp >= %s
-                """
-            ).format(schema=sql.Identifier(self.schema))
-
-            error_result = self._execute_query(
-                error_query, (facility_id, cutoff_date, facility_id, cutoff_date)
+            query_result = self._run_query(
+                "facility_summary", (facility_id, int(range_days), facility_id)
             )
 
-            # Combine results
-            result["rows"].extend(error_result["rows"])
+            # Unpivot the single row client-side, metadata first
+            rows = []
+            for summary_row in query_result["rows"][:1]:
+                # facility_id is NULL when the facility has no metadata row
+                if summary_row[2] is not None:
+                    rows.extend(zip(FACILITY_METADATA_METRICS, summary_row[3:]))
+                rows.extend(zip(("errors_total", "errors_critical"), summary_row[:2]))
+
+            result = {"columns": ["metric", "value"], "rows": rows}
 
             return self._format_result(
                 result, {"facility_id": facility_id, "range_days": range_days}
@@ -391,46 +524,8 @@ class RedshiftDataSource(TrackmanDataSource):
     ) -> Dict:
         """Get data quality metrics summary."""
         try:
-            self._validate_table_access("data_quality")
-
-            cutoff_date = self._get_date_filter(range_days)
-
-            if facility_id:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        facility_id,
-                        ROUND(AVG(data_quality_score), 2) as avg_quality_score,
-                        SUM(missing_records) as total_missing_records,
-                        ROUND(AVG(latency_ms), 2) as avg_latency_ms
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s AND facility_id = %s
-                    GROUP BY facility_id
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("data_quality"),
-                )
-                params = (cutoff_date, facility_id)
-            else:
-                query = sql.SQL(
-                    """
-                    SELECT
-                        facility_id,
-                        ROUND(AVG(data_quality_score), 2) as avg_quality_score,
-                        SUM(missing_records) as total_missing_records,
-                        ROUND(AVG(latency_ms), 2) as avg_latency_ms
-                    FROM {schema}.{table}
-                    WHERE timestamp >= %s
-                    GROUP BY facility_id
-                    """
-                ).format(
-                    schema=sql.Identifier(self.schema),
-                    table=sql.Identifier("data_quality"),
-                )
-                params = (cutoff_date,)
-
-            result = self._execute_query(query, params)
+            params = self._facility_params(range_days, facility_id)
+            result = self._run_query("data_quality_summary", params)
             return self._format_result(
                 result, {"range_days": range_days, "facility_id": facility_id}
             )
@@ -1,3 +1,4 @@
+import json
 from typing import Annotated
 
 from semantic_kernel.functions import kernel_function
@@ -7,6 +8,14 @@ from ..tools.question_answer_tool import QuestionAnswerTool
 from ..tools.text_processing_tool import TextProcessingTool
 from ..tools.trackman_query_tool import TrackmanQueryTool
 
+# Keys of a batch Trackman query, each with the conversion applied to its value
+TRACKMAN_QUERY_ARGS = {
+    "intent": str,
+    "range_days": int,
+    "facility_id": lambda value: "" if value is None else str(value),
+    "limit": int,
+}
+
 
 class ChatPlugin:
     def __init__(self, question: str, chat_history: list[dict]) -> None:
@@ -51,7 +60,7 @@ class ChatPlugin:
         self,
         intent: Annotated[
             str,
-            "Type of query: errors_summary, top_error_messages, connectivity_summary, disconnect_reasons, facility_summary, or data_quality_summary",
+            "Type of query: errors_summary, top_error_messages, top_error_messages_approx (counts estimated from a random sample, which change between calls and are not guaranteed to be faster; prefer top_error_messages), connectivity_summary, disconnect_reasons, facility_summary, or data_quality_summary",
         ],
         range_days: Annotated[int, "Number of days to look back (default: 30)"] = 30,
         facility_id: Annotated[
@@ -65,3 +74,39 @@ class ChatPlugin:
             facility_id=facility_id,
             limit=limit,
         )
+
+    @kernel_function(
+        description="Run several REAL-TIME Trackman metric queries at once. Use this instead of calling query_trackman_data repeatedly when the user asks for more than one kind of metric, e.g. errors, connectivity and data quality for the same facility."
+    )
+    async def query_trackman_data_batch(
+        self,
+        queries: Annotated[
+            str,
+            'JSON list of queries. Each is an object with "intent" (as for query_trackman_data) and optional "range_days", "facility_id" and "limit", e.g. [{"intent": "errors_summary", "facility_id": "FAC001"}, {"intent": "connectivity_summary", "facility_id": "FAC001"}]',
+        ],
+    ) -> Answer:
+        try:
+            requests = json.loads(queries)
+            if not isinstance(requests, list) or not all(
+                isinstance(request, dict) and "intent" in request
+                for request in requests
+            ):
+                raise ValueError("expected a list of objects with an intent")
+            # Values come from model-written JSON, so e.g. "7" becomes 7 here
+            # rather than reaching the data source as a string
+            requests = [
+                {
+                    key: convert(request[key])
+                    for key, convert in TRACKMAN_QUERY_ARGS.items()
+                    if key in request
+                }
+                for request in requests
+            ]
+        except (TypeError, ValueError) as e:
+            return Answer(question=self.question, answer=f"Invalid queries: {e}")
+
+        answers = await TrackmanQueryTool().query_trackman_many(requests)
+        return Answer(
+            question=self.question,
+            answer="\n\n".join(answer.answer for answer in answers),
+        )
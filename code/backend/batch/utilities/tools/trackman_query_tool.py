@@ -1,8 +1,17 @@
 """Trackman query tool for accessing operational data."""
 
+import asyncio
+import io
+import itertools
 import json
 import logging
-from typing import Annotated
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import date
+from typing import Annotated, List, Optional
 
 from semantic_kernel.functions import kernel_function
 
@@ -11,18 +20,97 @@ from ..helpers.trackman.data_source_factory import get_data_source
 
 logger = logging.getLogger(__name__)
 
+RESULT_CACHE_SIZE = 512
+
+# Rows rendered into the answer table when TRACKMAN_MAX_ROWS is unset or invalid
+DEFAULT_MAX_RENDER_ROWS = 200
+
+
+def _max_render_rows() -> int:
+    """Rows rendered into the answer table; the rest are summarised in a footer."""
+    value = os.getenv("TRACKMAN_MAX_ROWS", "")
+    try:
+        return int(value) if value else DEFAULT_MAX_RENDER_ROWS
+    except ValueError:
+        logger.warning(f"Ignoring invalid TRACKMAN_MAX_ROWS={value!r}")
+        return DEFAULT_MAX_RENDER_ROWS
+
 
 class TrackmanQueryTool:
     """Tool for querying Trackman operational data."""
 
-    VALID_INTENTS = [
-        "errors_summary",
-        "top_error_messages",
-        "connectivity_summary",
-        "disconnect_reasons",
-        "facility_summary",
-        "data_quality_summary",
-    ]
+    # Data source call for each intent, given (source, range_days, facility_id, limit)
+    _DISPATCH = {
+        "errors_summary": lambda ds, r, f, n: ds.get_errors_summary(r, f),
+        "top_error_messages": lambda ds, r, f, n: ds.get_top_error_messages(r, n, f),
+        "top_error_messages_approx": lambda ds, r, f, n: ds.get_top_error_messages(
+            r, n, f, approximate=True
+        ),
+        "connectivity_summary": lambda ds, r, f, n: ds.get_connectivity_summary(r, f),
+        "disconnect_reasons": lambda ds, r, f, n: ds.get_disconnect_reasons(r, f),
+        "facility_summary": lambda ds, r, f, n: ds.get_facility_summary(f, r),
+        "data_quality_summary": lambda ds, r, f, n: ds.get_data_quality_summary(r, f),
+    }
+
+    VALID_INTENTS = frozenset(_DISPATCH)
+
+    _INVALID_INTENT_MSG = "Invalid intent '{}'. Must be one of: " + ", ".join(_DISPATCH)
+
+    # Query results shared by all tool instances: (expires_at, result) by query key.
+    # Keys start with the id of the data source, so a reset or switched source
+    # never sees results of the previous one
+    _result_cache: OrderedDict = OrderedDict()
+    _result_cache_lock = threading.Lock()
+
+    # Id of each data source seen. Weakly keyed, so cached results do not
+    # keep a closed source and its connection pool alive
+    _source_ids: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+    _next_source_id = itertools.count()
+
+    @classmethod
+    def _source_id(cls, data_source) -> int:
+        """Id of data_source in cache keys, never reused by another source."""
+        with cls._result_cache_lock:
+            source_id = cls._source_ids.get(data_source)
+            if source_id is None:
+                source_id = cls._source_ids[data_source] = next(cls._next_source_id)
+            return source_id
+
+    @classmethod
+    def invalidate(cls, intent: Optional[str] = None):
+        """Drop cached results, for one intent or all of them."""
+        with cls._result_cache_lock:
+            if intent is None:
+                cls._result_cache.clear()
+            else:
+                for key in [key for key in cls._result_cache if key[1] == intent]:
+                    del cls._result_cache[key]
+
+    @classmethod
+    def _get_cached(cls, key: tuple) -> Optional[dict]:
+        """Return an unexpired cached result for key, if any."""
+        with cls._result_cache_lock:
+            entry = cls._result_cache.get(key)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at <= time.monotonic():
+                del cls._result_cache[key]
+                return None
+            cls._result_cache.move_to_end(key)
+            return result
+
+    @classmethod
+    def _set_cached(cls, key: tuple, result: dict):
+        """Cache result for TRACKMAN_CACHE_TTL seconds, evicting the oldest entries."""
+        ttl = float(os.getenv("TRACKMAN_CACHE_TTL", "300"))
+        if ttl <= 0:
+            return
+        with cls._result_cache_lock:
+            cls._result_cache[key] = (time.monotonic() + ttl, result)
+            cls._result_cache.move_to_end(key)
+            while len(cls._result_cache) > RESULT_CACHE_SIZE:
+                cls._result_cache.popitem(last=False)
 
     @kernel_function(
         description=(
@@ -37,8 +125,10 @@ class TrackmanQueryTool:
         intent: Annotated[
             str,
             "The type of query to perform. Must be one of: "
-            "errors_summary, top_error_messages, connectivity_summary, "
-            "disconnect_reasons, facility_summary, data_quality_summary",
+            "errors_summary, top_error_messages, top_error_messages_approx, "
+            "connectivity_summary, disconnect_reasons, facility_summary, data_quality_summary. "
+            "top_error_messages_approx returns counts estimated from a random sample, "
+            "which change between calls, and is not guaranteed to be faster",
         ],
         range_days: Annotated[
             int, "Number of days to look back for time-based queries (default: 30)"
@@ -55,51 +145,49 @@ class TrackmanQueryTool:
             intent: Type of query (e.g., 'errors_summary', 'facility_summary')
             range_days: Number of days to look back (default 30)
             facility_id: Optional facility ID filter
-            limit: Maximum results to return (for top_error_messages)
+            limit: Maximum results to return (for top_error_messages*)
 
         Returns:
             Answer object with query results
         """
         try:
             # Validate intent
-            if intent not in self.VALID_INTENTS:
-                error_msg = (
-                    f"Invalid intent '{intent}'. Must be one of: {', '.join(self.VALID_INTENTS)}"
-                )
+            query = self._DISPATCH.get(intent)
+            if query is None:
+                error_msg = self._INVALID_INTENT_MSG.format(intent)
                 logger.error(error_msg)
                 return Answer(question="", answer=error_msg, source_documents=[])
 
-            # Get data source
-            data_source = get_data_source()
-
             # Execute query based on intent
             facility_filter = facility_id if facility_id else None
 
-            if intent == "errors_summary":
-                result = data_source.get_errors_summary(range_days, facility_filter)
-
-            elif intent == "top_error_messages":
-                result = data_source.get_top_error_messages(
-                    range_days, limit, facility_filter
+            if intent == "facility_summary" and not facility_filter:
+                return Answer(
+                    question="",
+                    answer="facility_summary requires a facility_id parameter",
+                    source_documents=[],
                 )
 
-            elif intent == "connectivity_summary":
-                result = data_source.get_connectivity_summary(range_days, facility_filter)
-
-            elif intent == "disconnect_reasons":
-                result = data_source.get_disconnect_reasons(range_days, facility_filter)
-
-            elif intent == "facility_summary":
-                if not facility_id:
-                    return Answer(
-                        question="",
-                        answer="facility_summary requires a facility_id parameter",
-                        source_documents=[],
-                    )
-                result = data_source.get_facility_summary(facility_id, range_days)
+            # Get data source
+            data_source = get_data_source()
 
-            elif intent == "data_quality_summary":
-                result = data_source.get_data_quality_summary(range_days, facility_filter)
+            if data_source.memoizes_queries:
+                result = query(data_source, range_days, facility_filter, limit)
+            else:
+                # Repeated tool calls within a day reuse the cached result; the
+                # day is part of the key because range_days is relative to today
+                cache_key = (
+                    self._source_id(data_source),
+                    intent,
+                    range_days,
+                    facility_filter,
+                    limit,
+                    date.today().toordinal(),
+                )
+                result = self._get_cached(cache_key)
+                if result is None:
+                    result = query(data_source, range_days, facility_filter, limit)
+                    self._set_cached(cache_key, result)
 
             # Format result as answer
             answer_text = self._format_result(result, intent)
@@ -117,6 +205,31 @@ class TrackmanQueryTool:
             logger.error(error_msg, exc_info=True)
             return Answer(question="", answer=error_msg, source_documents=[])
 
+    async def query_trackman_many(self, requests: List[dict]) -> List[Answer]:
+        """
+        Execute several Trackman queries concurrently.
+
+        At most max_concurrent_queries of the data source run at once, so a
+        batch does not hold more worker threads than the source can serve.
+
+        Args:
+            requests: query_trackman keyword arguments, one dict per query
+
+        Returns:
+            Answer objects in the order of requests
+        """
+        # The first call may load every workbook or open the Redshift pool,
+        # so it runs on a worker thread rather than blocking the event loop
+        data_source = await asyncio.to_thread(get_data_source)
+        limit = data_source.max_concurrent_queries
+        semaphore = asyncio.Semaphore(limit or max(len(requests), 1))
+
+        async def run(request: dict) -> Answer:
+            async with semaphore:
+                return await asyncio.to_thread(self.query_trackman, **request)
+
+        return list(await asyncio.gather(*(run(request) for request in requests)))
+
     def _format_result(self, result: dict, intent: str) -> str:
         """Format query result as readable text with table."""
         try:
@@ -145,22 +258,20 @@ class TrackmanQueryTool:
 
             summary_lines.append("")  # Empty line before table
 
-            # Build markdown table
-            if columns and rows:
-                # Header row
-                header = "| " + " | ".join(str(col) for col in columns) + " |"
-                separator = "|" + "|".join("---" for _ in columns) + "|"
-
-                table_lines = [header, separator]
-
-                # Data rows
-                for row in rows:
-                    row_str = "| " + " | ".join(str(cell) for cell in row) + " |"
-                    table_lines.append(row_str)
+            if not columns:
+                return "\n".join(summary_lines)
 
-                summary_lines.extend(table_lines)
+            # Build markdown table, capped at TRACKMAN_MAX_ROWS rows
+            max_rows = _max_render_rows()
+            buf = io.StringIO()
+            buf.write("| " + " | ".join(map(str, columns)) + " |\n")
+            buf.write("|" + "|".join("---" for _ in columns) + "|\n")
+            for row in itertools.islice(rows, max_rows):
+                buf.write("| " + " | ".join(map(str, row)) + " |\n")
+            if len(rows) > max_rows:
+                buf.write(f"\n_... {len(rows) - max_rows} more rows omitted_\n")
 
-            return "\n".join(summary_lines)
+            return "\n".join(summary_lines) + "\n" + buf.getvalue().rstrip("\n")
 
         except Exception as e:
             logger.error(f"Error formatting result: {str(e)}")
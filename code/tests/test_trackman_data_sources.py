@@ -2,31 +2,37 @@
 
 import os
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pandas as pd
 import pytest
 
-from code.backend.batch.utilities.helpers.trackman.excel_data_source import (
+from backend.batch.utilities.helpers.trackman.excel_data_source import (
     ExcelDataSource,
 )
-from code.backend.batch.utilities.helpers.trackman.redshift_config import (
+from backend.batch.utilities.helpers.trackman.redshift_config import (
     validate_columns,
     validate_table,
 )
-from code.backend.batch.utilities.helpers.trackman.redshift_data_source import (
+from backend.batch.utilities.helpers.trackman.redshift_data_source import (
     RedshiftDataSource,
 )
-from code.backend.batch.utilities.helpers.trackman.data_source_factory import (
+from backend.batch.utilities.helpers.trackman.data_source_factory import (
     get_data_source,
     reset_data_source,
 )
+from tests.trackman_fakes import FakeConnection
 
 
-@pytest.fixture
-def sample_excel_data(tmp_path):
-    """Create sample Excel file for testing."""
-    excel_path = tmp_path / "test_trackman_data.xlsx"
+@pytest.fixture(scope="session")
+def sample_excel_data(tmp_path_factory):
+    """Create a directory with a sample Excel file, shared by the whole session.
+
+    Tests only read the data, so it is written once; a test that needs to
+    change the files must copy the directory first.
+    """
+    data_dir = tmp_path_factory.mktemp("trackman")
+    excel_path = data_dir / "test_trackman_data.xlsx"
 
     # Create sample data
     now = datetime.now()
@@ -57,8 +63,7 @@ def sample_excel_data(tmp_path):
                 "",
                 "timeout",
             ]
-            * 2
-            + ["", "network_issue"],
+            + ["", "network_issue"] * 2,
         }
     )
 
@@ -86,13 +91,13 @@ def sample_excel_data(tmp_path):
     )
 
     # Write to Excel
-    with pd.ExcelWriter(excel_path, engine="openpyxl") as writer:
+    with pd.ExcelWriter(excel_path, engine="xlsxwriter") as writer:
         errors_data.to_excel(writer, sheet_name="errors", index=False)
         connectivity_data.to_excel(writer, sheet_name="connectivity", index=False)
         facility_metadata.to_excel(writer, sheet_name="facility_metadata", index=False)
         data_quality.to_excel(writer, sheet_name="data_quality", index=False)
 
-    return str(excel_path)
+    return str(data_dir)
 
 
 class TestExcelDataSource:
@@ -216,8 +221,8 @@ class TestRedshiftDataSource:
             },
         ):
             ds = RedshiftDataSource()
-            assert ds.host == "test.redshift.amazonaws.com"
-            assert ds.database == "testdb"
+            assert ds.config.host == "test.redshift.amazonaws.com"
+            assert ds.config.database == "testdb"
 
     def test_initialization_failure(self):
         """Test initialization failure with missing env vars."""
@@ -228,18 +233,11 @@ class TestRedshiftDataSource:
     @patch("psycopg2.connect")
     def test_parameterized_query(self, mock_connect):
         """Test that queries use parameterized SQL."""
-        # Setup mock
-        mock_conn = MagicMock()
-        mock_cursor = MagicMock()
-        mock_cursor.fetchall.return_value = [("FAC001", 10, 2, 3)]
-        mock_cursor.description = [
-            ("facility_id",),
-            ("error_count",),
-            ("critical_count",),
-            ("unique_errors",),
-        ]
-        mock_conn.cursor.return_value.__enter__.return_value = mock_cursor
-        mock_connect.return_value = mock_conn
+        conn = FakeConnection(
+            [("FAC001", 10, 2, 3)],
+            columns=("facility_id", "error_count", "critical_count", "unique_errors"),
+        )
+        mock_connect.return_value = conn
 
         with patch.dict(
             os.environ,
@@ -252,12 +250,13 @@ class TestRedshiftDataSource:
         ):
             ds = RedshiftDataSource()
             result = ds.get_errors_summary(range_days=30)
+            ds.close()
 
-            # Verify parameterized query was called
-            assert mock_cursor.execute.called
-            call_args = mock_cursor.execute.call_args
-            # Should have parameters tuple
-            assert call_args[0][1] is not None or len(call_args[0]) > 1
+        # The values are bound as parameters, never inlined into the SQL
+        query, params = conn.executed[-1]
+        assert params == (30, None, None)
+        assert "%s" in repr(query)
+        assert result["rows"] == [("FAC001", 10, 2, 3)]
 
     @patch("psycopg2.connect")
     def test_table_allowlist_enforcement(self, mock_connect):
@@ -284,13 +283,22 @@ class TestRedshiftDataSource:
 class TestDataSourceFactory:
     """Tests for data source factory."""
 
+    @pytest.fixture
+    def empty_data_dir(self, tmp_path):
+        """Data directory without workbooks.
+
+        The factory tests only check which source is built, so they need no
+        data and the Excel source they get skips parsing entirely.
+        """
+        return str(tmp_path)
+
     def teardown_method(self):
         """Reset data source after each test."""
         reset_data_source()
 
-    def test_get_excel_data_source_default(self, sample_excel_data):
+    def test_get_excel_data_source_default(self, empty_data_dir):
         """Test getting Excel data source by default."""
-        with patch.dict(os.environ, {"TRACKMAN_EXCEL_PATH": sample_excel_data}):
+        with patch.dict(os.environ, {"TRACKMAN_DATA_DIR": empty_data_dir}):
             ds = get_data_source()
             assert isinstance(ds, ExcelDataSource)
 
@@ -309,19 +317,19 @@ class TestDataSourceFactory:
             ds = get_data_source()
             assert isinstance(ds, RedshiftDataSource)
 
-    def test_fallback_to_excel_on_missing_vars(self, sample_excel_data):
+    def test_fallback_to_excel_on_missing_vars(self, empty_data_dir):
         """Test fallback to Excel when Redshift vars missing."""
         with patch.dict(
             os.environ,
-            {"USE_REDSHIFT": "true", "TRACKMAN_EXCEL_PATH": sample_excel_data},
+            {"USE_REDSHIFT": "true", "TRACKMAN_DATA_DIR": empty_data_dir},
             clear=True,
         ):
             ds = get_data_source()
             assert isinstance(ds, ExcelDataSource)
 
-    def test_singleton_behavior(self, sample_excel_data):
+    def test_singleton_behavior(self, empty_data_dir):
         """Test that factory returns same instance."""
-        with patch.dict(os.environ, {"TRACKMAN_EXCEL_PATH": sample_excel_data}):
+        with patch.dict(os.environ, {"TRACKMAN_DATA_DIR": empty_data_dir}):
             ds1 = get_data_source()
             ds2 = get_data_source()
             assert ds1 is ds2
@@ -0,0 +1,49 @@
+"""Stand-in psycopg2 connections for the Trackman Redshift data source tests."""
+
+from types import SimpleNamespace
+
+import psycopg2.extensions
+
+
+class FakeCursor:
+    """Stand-in psycopg2 cursor recording statements on its connection."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.description = [(column,) for column in connection.columns]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=None):
+        self.connection.executed.append((query, params))
+
+    def fetchall(self):
+        # Result sets are served in order; the last one repeats
+        results = self.connection.results
+        return results.pop(0) if len(results) > 1 else results[0]
+
+
+class FakeConnection:
+    """Stand-in psycopg2 connection with just what the pool and data source use."""
+
+    def __init__(self, *results, columns=("col",)):
+        self.results = list(results) or [[]]
+        self.columns = columns
+        self.executed = []
+        self.closed = 0
+        self.info = SimpleNamespace(
+            transaction_status=psycopg2.extensions.TRANSACTION_STATUS_IDLE
+        )
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = 1
@@ -80,3 +80,101 @@ async def test_text_processing(TextProcessingToolMock: MagicMock):
         text=text,
         operation=operation,
     )
+
+
+@patch("backend.batch.utilities.plugins.chat_plugin.TrackmanQueryTool")
+@pytest.mark.asyncio
+async def test_query_trackman_data_batch(TrackmanQueryToolMock: MagicMock):
+    # given
+    kernel = Kernel()
+
+    question = "mock-question"
+
+    plugin = kernel.add_plugin(
+        plugin=ChatPlugin(question=question, chat_history=[]),
+        plugin_name="Chat",
+    )
+
+    async def query_many(requests):
+        return [Answer(question="", answer=request["intent"]) for request in requests]
+
+    TrackmanQueryToolMock.return_value.query_trackman_many.side_effect = query_many
+
+    # when
+    answer = await kernel.invoke(
+        plugin["query_trackman_data_batch"],
+        queries='[{"intent": "errors_summary", "facility_id": "FAC001", "extra": 1}, {"intent": "connectivity_summary"}]',
+    )
+
+    # then
+    assert answer.value == Answer(
+        question=question, answer="errors_summary\n\nconnectivity_summary"
+    )
+    TrackmanQueryToolMock.return_value.query_trackman_many.assert_called_once_with(
+        [
+            {"intent": "errors_summary", "facility_id": "FAC001"},
+            {"intent": "connectivity_summary"},
+        ]
+    )
+
+
+@patch("backend.batch.utilities.plugins.chat_plugin.TrackmanQueryTool")
+@pytest.mark.asyncio
+async def test_query_trackman_data_batch_converts_values(
+    TrackmanQueryToolMock: MagicMock,
+):
+    # given
+    kernel = Kernel()
+
+    plugin = kernel.add_plugin(
+        plugin=ChatPlugin(question="mock-question", chat_history=[]),
+        plugin_name="Chat",
+    )
+
+    async def query_many(requests):
+        return [Answer(question="", answer=request["intent"]) for request in requests]
+
+    TrackmanQueryToolMock.return_value.query_trackman_many.side_effect = query_many
+
+    # when
+    await kernel.invoke(
+        plugin["query_trackman_data_batch"],
+        queries='[{"intent": "top_error_messages", "range_days": "7", "limit": 5.0, "facility_id": null}]',
+    )
+
+    # then
+    TrackmanQueryToolMock.return_value.query_trackman_many.assert_called_once_with(
+        [
+            {
+                "intent": "top_error_messages",
+                "range_days": 7,
+                "limit": 5,
+                "facility_id": "",
+            }
+        ]
+    )
+
+
+@patch("backend.batch.utilities.plugins.chat_plugin.TrackmanQueryTool")
+@pytest.mark.asyncio
+async def test_query_trackman_data_batch_rejects_invalid_values(
+    TrackmanQueryToolMock: MagicMock,
+):
+    # given
+    kernel = Kernel()
+    question = "mock-question"
+
+    plugin = kernel.add_plugin(
+        plugin=ChatPlugin(question=question, chat_history=[]),
+        plugin_name="Chat",
+    )
+
+    # when
+    answer = await kernel.invoke(
+        plugin["query_trackman_data_batch"],
+        queries='[{"intent": "errors_summary", "range_days": "last week"}]',
+    )
+
+    # then
+    assert answer.value.answer.startswith("Invalid queries: ")
+    TrackmanQueryToolMock.return_value.query_trackman_many.assert_not_called()
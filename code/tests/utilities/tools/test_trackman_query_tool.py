@@ -0,0 +1,290 @@
+import gc
+import threading
+import time
+import weakref
+from unittest.mock import MagicMock, patch
+
+import pytest
+from backend.batch.utilities.tools.trackman_query_tool import TrackmanQueryTool
+
+RESULT = {
+    "columns": ["error_code", "count"],
+    "rows": [["E1", 3]],
+    "metadata": {"source": "excel", "rowCount": 1, "range_days": 30},
+}
+
+
+@pytest.fixture(autouse=True)
+def data_source_mock():
+    with patch(
+        "backend.batch.utilities.tools.trackman_query_tool.get_data_source"
+    ) as mock:
+        data_source = mock.return_value
+        data_source.memoizes_queries = False
+        data_source.max_concurrent_queries = None
+        data_source.get_errors_summary.return_value = RESULT
+        data_source.get_connectivity_summary.return_value = RESULT
+
+        TrackmanQueryTool.invalidate()
+        yield data_source
+        TrackmanQueryTool.invalidate()
+
+
+def test_repeated_query_is_served_from_cache(data_source_mock):
+    # given
+    tool = TrackmanQueryTool()
+
+    # when
+    first = tool.query_trackman("errors_summary", 30, "FAC001")
+    second = TrackmanQueryTool().query_trackman("errors_summary", 30, "FAC001")
+
+    # then
+    assert first.answer == second.answer
+    assert "| E1 | 3 |" in second.answer
+    data_source_mock.get_errors_summary.assert_called_once_with(30, "FAC001")
+
+
+def test_switched_data_source_is_not_served_stale_results(data_source_mock):
+    # given
+    tool = TrackmanQueryTool()
+    tool.query_trackman("errors_summary", 30)
+
+    # when
+    with patch(
+        "backend.batch.utilities.tools.trackman_query_tool.get_data_source"
+    ) as new_source:
+        new_source.return_value.memoizes_queries = False
+        new_source.return_value.get_errors_summary.return_value = RESULT
+        tool.query_trackman("errors_summary", 30)
+
+    # then
+    data_source_mock.get_errors_summary.assert_called_once_with(30, None)
+    new_source.return_value.get_errors_summary.assert_called_once_with(30, None)
+
+
+def test_cached_results_do_not_keep_data_source_alive(data_source_mock):
+    # given
+    sources = [MagicMock(memoizes_queries=False)]
+    sources[0].get_errors_summary.return_value = RESULT
+    source_ref = weakref.ref(sources[0])
+
+    with patch(
+        "backend.batch.utilities.tools.trackman_query_tool.get_data_source",
+        side_effect=lambda: sources[0],
+    ):
+        TrackmanQueryTool().query_trackman("errors_summary", 30)
+
+    # when
+    sources.clear()
+    gc.collect()
+
+    # then
+    assert TrackmanQueryTool._result_cache
+    assert source_ref() is None
+
+
+def test_self_memoizing_source_is_not_cached(data_source_mock):
+    # given
+    data_source_mock.memoizes_queries = True
+    tool = TrackmanQueryTool()
+
+    # when
+    tool.query_trackman("errors_summary", 30)
+    tool.query_trackman("errors_summary", 30)
+
+    # then
+    assert data_source_mock.get_errors_summary.call_count == 2
+
+
+def test_different_parameters_are_cached_separately(data_source_mock):
+    # given
+    tool = TrackmanQueryTool()
+
+    # when
+    tool.query_trackman("errors_summary", 30, "FAC001")
+    tool.query_trackman("errors_summary", 7, "FAC001")
+    tool.query_trackman("errors_summary", 30, "")
+
+    # then
+    assert data_source_mock.get_errors_summary.call_count == 3
+
+
+def test_invalidate_intent_only_drops_that_intent(data_source_mock):
+    # given
+    tool = TrackmanQueryTool()
+    tool.query_trackman("errors_summary", 30)
+    tool.query_trackman("connectivity_summary", 30)
+
+    # when
+    TrackmanQueryTool.invalidate("errors_summary")
+    tool.query_trackman("errors_summary", 30)
+    tool.query_trackman("connectivity_summary", 30)
+
+    # then
+    assert data_source_mock.get_errors_summary.call_count == 2
+    assert data_source_mock.get_connectivity_summary.call_count == 1
+
+
+def test_zero_ttl_disables_cache(data_source_mock, monkeypatch):
+    # given
+    monkeypatch.setenv("TRACKMAN_CACHE_TTL", "0")
+    tool = TrackmanQueryTool()
+
+    # when
+    tool.query_trackman("errors_summary", 30)
+    tool.query_trackman("errors_summary", 30)
+
+    # then
+    assert data_source_mock.get_errors_summary.call_count == 2
+
+
+def test_failed_query_is_not_cached(data_source_mock):
+    # given
+    data_source_mock.get_errors_summary.side_effect = [RuntimeError("boom"), RESULT]
+    tool = TrackmanQueryTool()
+
+    # when
+    failed = tool.query_trackman("errors_summary", 30)
+    succeeded = tool.query_trackman("errors_summary", 30)
+
+    # then
+    assert "boom" in failed.answer
+    assert "| E1 | 3 |" in succeeded.answer
+
+
+def test_large_result_is_truncated(data_source_mock, monkeypatch):
+    # given
+    monkeypatch.setenv("TRACKMAN_MAX_ROWS", "200")
+    data_source_mock.get_connectivity_summary.return_value = {
+        "columns": ["facility_id", "count"],
+        "rows": [[f"FAC{i:03d}", i] for i in range(250)],
+        "metadata": {"source": "excel", "rowCount": 250},
+    }
+
+    # when
+    answer = TrackmanQueryTool().query_trackman("connectivity_summary", 30)
+
+    # then
+    assert "Results: 250 rows" in answer.answer
+    assert "| FAC199 | 199 |" in answer.answer
+    assert "FAC200" not in answer.answer
+    assert answer.answer.endswith("_... 50 more rows omitted_")
+
+
+def test_invalid_max_rows_falls_back_to_default(data_source_mock, monkeypatch):
+    # given
+    monkeypatch.setenv("TRACKMAN_MAX_ROWS", "lots")
+    data_source_mock.get_connectivity_summary.return_value = {
+        "columns": ["facility_id", "count"],
+        "rows": [[f"FAC{i:03d}", i] for i in range(250)],
+        "metadata": {"source": "excel", "rowCount": 250},
+    }
+
+    # when
+    answer = TrackmanQueryTool().query_trackman("connectivity_summary", 30)
+
+    # then
+    assert "| FAC199 | 199 |" in answer.answer
+    assert answer.answer.endswith("_... 50 more rows omitted_")
+
+
+def test_approximate_top_errors_intent(data_source_mock):
+    # given
+    data_source_mock.get_top_error_messages.return_value = RESULT
+
+    # when
+    TrackmanQueryTool().query_trackman("top_error_messages_approx", 7, "", 5)
+
+    # then
+    data_source_mock.get_top_error_messages.assert_called_once_with(
+        7, 5, None, approximate=True
+    )
+
+
+def test_invalid_intent_lists_valid_intents(data_source_mock):
+    # when
+    answer = TrackmanQueryTool().query_trackman("unknown_intent")
+
+    # then
+    assert answer.answer.startswith("Invalid intent 'unknown_intent'. Must be one of: ")
+    for intent in TrackmanQueryTool.VALID_INTENTS:
+        assert intent in answer.answer
+
+
+def test_facility_summary_requires_facility(data_source_mock):
+    # when
+    answer = TrackmanQueryTool().query_trackman("facility_summary", 30)
+
+    # then
+    assert answer.answer == "facility_summary requires a facility_id parameter"
+    data_source_mock.get_facility_summary.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_query_many_returns_answers_in_request_order(data_source_mock):
+    # when
+    answers = await TrackmanQueryTool().query_trackman_many(
+        [
+            {"intent": "errors_summary", "facility_id": "FAC001"},
+            {"intent": "unknown_intent"},
+            {"intent": "connectivity_summary", "range_days": 7},
+        ]
+    )
+
+    # then
+    assert len(answers) == 3
+    assert "Errors Summary" in answers[0].answer
+    assert answers[1].answer.startswith("Invalid intent 'unknown_intent'")
+    assert "Connectivity Summary" in answers[2].answer
+    data_source_mock.get_connectivity_summary.assert_called_once_with(7, None)
+
+
+@pytest.mark.asyncio
+async def test_query_many_limits_concurrency_to_data_source(data_source_mock):
+    # given
+    data_source_mock.max_concurrent_queries = 2
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def slow_query(range_days, facility_id):
+        with lock:
+            running.append(facility_id)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(facility_id)
+        return RESULT
+
+    data_source_mock.get_errors_summary.side_effect = slow_query
+
+    # when
+    answers = await TrackmanQueryTool().query_trackman_many(
+        [{"intent": "errors_summary", "facility_id": f"FAC{i:03d}"} for i in range(6)]
+    )
+
+    # then
+    assert all("| E1 | 3 |" in answer.answer for answer in answers)
+    assert max(peak) == 2
+
+
+@pytest.mark.asyncio
+async def test_query_many_gets_data_source_off_the_event_loop(data_source_mock):
+    # given
+    event_loop_thread = threading.current_thread()
+    callers = []
+
+    def get_data_source():
+        callers.append(threading.current_thread())
+        return data_source_mock
+
+    with patch(
+        "backend.batch.utilities.tools.trackman_query_tool.get_data_source",
+        side_effect=get_data_source,
+    ):
+        # when
+        await TrackmanQueryTool().query_trackman_many([{"intent": "errors_summary"}])
+
+    # then
+    assert callers
+    assert event_loop_thread not in callers
@@ -0,0 +1,30 @@
+"""
+Build the Trackman Excel columnar cache ahead of starting the app.
+Run once per deployment so app workers memory-map the cached sheets
+instead of each parsing every Excel file on start-up.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent / "code"))
+
+from backend.batch.utilities.helpers.trackman.excel_data_source import (  # noqa: E402
+    ExcelDataSource,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def build_cache(data_dir: str = None):
+    """Load the Excel files once, writing the cache if it is missing or stale."""
+    source = ExcelDataSource(data_dir=data_dir)
+    for sheet, rows in source.row_counts().items():
+        logger.info(f"{sheet}: {rows} rows")
+    logger.info(f"Cache directory: {source.cache_dir}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    build_cache(sys.argv[1] if len(sys.argv) > 1 else None)
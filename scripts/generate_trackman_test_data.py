@@ -3,31 +3,42 @@ Generate sample Trackman test data in Excel format.
 This script creates realistic test data for development and demo purposes.
 """
 
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
-import random
+from datetime import datetime
 import sys
 from pathlib import Path
+from typing import Optional
 
-def generate_test_data(output_path: str = "data/testtrack/trackman_test_data.xlsx"):
+def generate_test_data(
+    output_path: str = "data/testtrack/trackman_test_data.xlsx", seed: Optional[int] = None
+):
     """Generate sample Trackman data with realistic values."""
 
+    rng = np.random.default_rng(seed)
+
     # Generate timestamps for the past 30 days
-    base_time = datetime.now()
-    timestamps = [
-        base_time - timedelta(days=random.randint(0, 30), hours=random.randint(0, 23))
-        for _ in range(100)
-    ]
+    base_time = pd.Timestamp(datetime.now())
+    timestamps = (
+        base_time
+        - pd.to_timedelta(rng.integers(0, 31, 100), unit='D')
+        - pd.to_timedelta(rng.integers(0, 24, 100), unit='h')
+    )
+
+    # FAC001..FAC003 and UNIT001..UNIT010, cycling by row
+    row = np.arange(50)
+    facility_ids = np.char.add('FAC', np.char.zfill((row % 3 + 1).astype(str), 3))
+    unit_ids = np.char.add('UNIT', np.char.zfill((row % 10 + 1).astype(str), 3))
 
     # Errors sheet
     errors_data = {
-        'timestamp': [timestamps[i] for i in range(50)],
-        'facility_id': [f'FAC{str(i%3 + 1).zfill(3)}' for i in range(50)],
-        'unit_id': [f'UNIT{str(i%10 + 1).zfill(3)}' for i in range(50)],
-        'unit_model': [random.choice(['TrackMan 4', 'TrackMan 4+', 'TrackMan Range']) for _ in range(50)],
-        'error_code': [random.choice(['E001', 'E002', 'E003', 'E004', 'E005']) for _ in range(50)],
-        'severity': [random.choice(['INFO', 'WARNING', 'ERROR', 'CRITICAL']) for _ in range(50)],
-        'error_message': [random.choice([
+        'timestamp': timestamps[:50],
+        'facility_id': facility_ids,
+        'unit_id': unit_ids,
+        'unit_model': rng.choice(['TrackMan 4', 'TrackMan 4+', 'TrackMan Range'], size=50),
+        'error_code': rng.choice(['E001', 'E002', 'E003', 'E004', 'E005'], size=50),
+        'severity': rng.choice(['INFO', 'WARNING', 'ERROR', 'CRITICAL'], size=50),
+        'error_message': rng.choice([
             'Sensor calibration failed',
             'Network connection timeout',
             'Data synchronization error',
@@ -35,23 +46,23 @@ def generate_test_data(output_path: str = "data/testtrack/trackman_test_data.xls
             'Temperature threshold exceeded',
             'Camera alignment issue',
             'Radar initialization failed'
-        ]) for _ in range(50)]
+        ], size=50)
     }
 
     # Connectivity sheet
     connectivity_data = {
-        'timestamp': [timestamps[i] for i in range(50, 100)],
-        'facility_id': [f'FAC{str(i%3 + 1).zfill(3)}' for i in range(50)],
-        'unit_id': [f'UNIT{str(i%10 + 1).zfill(3)}' for i in range(50)],
-        'connectivity_status': [random.choice(['ONLINE', 'OFFLINE']) for _ in range(50)],
-        'disconnect_reason': [random.choice([
+        'timestamp': timestamps[50:],
+        'facility_id': facility_ids,
+        'unit_id': unit_ids,
+        'connectivity_status': rng.choice(['ONLINE', 'OFFLINE'], size=50),
+        'disconnect_reason': rng.choice(np.array([
             'Network Timeout',
             'Power Loss',
             'Manual Disconnect',
             'Firmware Update',
             'Connection Refused',
             None
-        ]) for _ in range(50)]
+        ], dtype=object), size=50)
     }
 
     # Facility metadata sheet
@@ -68,11 +79,11 @@ def generate_test_data(output_path: str = "data/testtrack/trackman_test_data.xls
 
     # Data quality sheet
     data_quality_data = {
-        'timestamp': [base_time - timedelta(days=i) for i in range(30)],
-        'facility_id': [f'FAC{str((i%3) + 1).zfill(3)}' for i in range(30)],
-        'data_quality_score': [round(random.uniform(0.85, 0.99), 4) for _ in range(30)],
-        'missing_records': [random.randint(0, 50) for _ in range(30)],
-        'latency_ms': [random.randint(50, 500) for _ in range(30)]
+        'timestamp': base_time - pd.to_timedelta(np.arange(30), unit='D'),
+        'facility_id': facility_ids[:30],
+        'data_quality_score': rng.uniform(0.85, 0.99, 30).round(4),
+        'missing_records': rng.integers(0, 51, 30),
+        'latency_ms': rng.integers(50, 501, 30)
     }
 
     # Create DataFrames
@@ -86,7 +97,7 @@ def generate_test_data(output_path: str = "data/testtrack/trackman_test_data.xls
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
     # Write to Excel with multiple sheets
-    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
+    with pd.ExcelWriter(output_path, engine='xlsxwriter') as writer:
         errors_df.to_excel(writer, sheet_name='errors', index=False)
         connectivity_df.to_excel(writer, sheet_name='connectivity', index=False)
         facility_metadata_df.to_excel(writer, sheet_name='facility_metadata', index=False)
@@ -4,11 +4,14 @@ Populate the local PostgreSQL test database with sample Trackman data.
 This script creates the same test data that would exist in Redshift.
 """
 
+import csv
+import io
 import os
 import sys
-from datetime import datetime, timedelta
+from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import psycopg2
 from psycopg2.extras import execute_values
 
@@ -38,11 +41,10 @@ def generate_sample_data():
     ]
 
     # Generate errors for last 30 days
-    errors = []
-    base_date = datetime.now()
-    facilities_ids = [f[0] for f in facilities]
+    base_date = np.datetime64(datetime.now(), "us")
+    facilities_ids = np.array([f[0] for f in facilities])
 
-    error_templates = [
+    error_templates = np.array([
         ("E001", "LOW", "Sensor calibration drift detected"),
         ("E002", "MEDIUM", "Camera sync timeout"),
         ("E003", "HIGH", "Ball tracking lost"),
@@ -51,57 +53,81 @@ def generate_sample_data():
         ("E006", "MEDIUM", "Storage capacity warning"),
         ("E007", "HIGH", "Hardware temperature exceeded"),
         ("E008", "CRITICAL", "Database connection failed"),
-    ]
-
-    unit_models = ["TrackMan 4", "TrackMan iO", "TrackMan Range"]
-
-    for day in range(30):
-        date = base_date - timedelta(days=day)
-        num_errors = 5 + (day % 10)  # Varying number of errors per day
-
-        for i in range(num_errors):
-            facility_id = facilities_ids[i % len(facilities_ids)]
-            unit_id = f"{facility_id}-U{(i % 3) + 1}"
-            unit_model = unit_models[i % len(unit_models)]
-            error_code, severity, message = error_templates[i % len(error_templates)]
-
-            timestamp = date - timedelta(hours=i % 24, minutes=(i * 13) % 60)
-            errors.append((timestamp, facility_id, unit_id, unit_model, error_code, severity, message))
-
-    # Generate connectivity data
-    connectivity = []
-    for day in range(30):
-        date = base_date - timedelta(days=day)
-
-        for fac_id in facilities_ids:
-            for unit_num in range(1, 4):
-                unit_id = f"{fac_id}-U{unit_num}"
+    ])
+
+    unit_models = np.array(["TrackMan 4", "TrackMan iO", "TrackMan Range"])
+
+    # 5 + (day % 10) errors per day; i numbers the errors within each day
+    days = np.arange(30)
+    errors_per_day = 5 + (days % 10)
+    day = np.repeat(days, errors_per_day)
+    i = np.arange(len(day)) - np.repeat(np.cumsum(errors_per_day) - errors_per_day, errors_per_day)
+
+    facility_id = facilities_ids[i % len(facilities_ids)]
+    template = error_templates[i % len(error_templates)]
+    timestamp = (
+        base_date
+        - day.astype("timedelta64[D]")
+        - (i % 24).astype("timedelta64[h]")
+        - ((i * 13) % 60).astype("timedelta64[m]")
+    )
+    errors = list(zip(
+        timestamp.tolist(),
+        facility_id.tolist(),
+        np.char.add(np.char.add(facility_id, "-U"), ((i % 3) + 1).astype(str)).tolist(),
+        unit_models[i % len(unit_models)].tolist(),
+        template[:, 0].tolist(),
+        template[:, 1].tolist(),
+        template[:, 2].tolist(),
+    ))
+
+    # Generate connectivity data, one row per day, facility and unit
+    day, fac, unit_num = (
+        grid.ravel()
+        for grid in np.meshgrid(days, np.arange(len(facilities_ids)), np.arange(1, 4), indexing="ij")
+    )
+    fac_id = facilities_ids[fac]
+
+    # Most units online, occasional offline
+    online = (day + unit_num) % 7 != 0
+    reasons = np.array(["Network timeout", "Power loss", "Manual disconnect"], dtype=object)
+    timestamp = base_date - day.astype("timedelta64[D]") - (8 + unit_num * 4).astype("timedelta64[h]")
+    connectivity = list(zip(
+        timestamp.tolist(),
+        fac_id.tolist(),
+        np.char.add(np.char.add(fac_id, "-U"), unit_num.astype(str)).tolist(),
+        np.where(online, "ONLINE", "OFFLINE").tolist(),
+        np.where(online, None, reasons[unit_num % 3]).tolist(),
+    ))
+
+    # Generate data quality metrics, one row per day and facility
+    day, fac = (grid.ravel() for grid in np.meshgrid(days, np.arange(len(facilities_ids)), indexing="ij"))
+
+    # Quality score varies by facility and day
+    base_score = 85.0 + np.array([hash(fac_id) % 10 for fac_id in facilities_ids])[fac]
+    daily_variance = (day % 15) - 7
+    score = np.clip(base_score + daily_variance, 60.0, 100.0)
+
+    data_quality = list(zip(
+        (base_date - day.astype("timedelta64[D]") - np.timedelta64(12, "h")).tolist(),
+        facilities_ids[fac].tolist(),
+        score.tolist(),
+        ((100 - score) * 0.5).astype(int).tolist(),
+        (50.0 + (100 - score) * 2.0).tolist(),
+    ))
 
-                # Most units online, occasional offline
-                status = "ONLINE" if (day + unit_num) % 7 != 0 else "OFFLINE"
-                reason = None if status == "ONLINE" else ["Network timeout", "Power loss", "Manual disconnect"][unit_num % 3]
-
-                timestamp = date - timedelta(hours=8 + unit_num * 4)
-                connectivity.append((timestamp, fac_id, unit_id, status, reason))
-
-    # Generate data quality metrics
-    data_quality = []
-    for day in range(30):
-        date = base_date - timedelta(days=day)
-
-        for fac_id in facilities_ids:
-            # Quality score varies by facility and day
-            base_score = 85.0 + (hash(fac_id) % 10)
-            daily_variance = (day % 15) - 7
-            score = min(100.0, max(60.0, base_score + daily_variance))
-
-            missing = int((100 - score) * 0.5)
-            latency = 50.0 + (100 - score) * 2.0
+    return facilities, errors, connectivity, data_quality
 
-            timestamp = date - timedelta(hours=12)
-            data_quality.append((timestamp, fac_id, score, missing, latency))
 
-    return facilities, errors, connectivity, data_quality
+def copy_rows(cursor, table, columns, rows):
+    """Bulk load rows into table with a single COPY ... FROM STDIN."""
+    buf = io.StringIO()
+    # csv writes None as an unquoted empty field, which COPY reads as NULL
+    csv.writer(buf).writerows(rows)
+    buf.seek(0)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT CSV)", buf
+    )
 
 
 def populate_database():
@@ -133,45 +159,38 @@ def populate_database():
                 strokes_tracked = EXCLUDED.strokes_tracked,
                 tournaments_hosted = EXCLUDED.tournaments_hosted
             """,
-            facilities
+            facilities,
+            page_size=1000,
         )
 
         # Insert errors
         print(f"Inserting {len(errors)} error records...")
-        execute_values(
+        copy_rows(
             cursor,
-            """
-            INSERT INTO errors
-            (timestamp, facility_id, unit_id, unit_model, error_code, severity, error_message)
-            VALUES %s
-            """,
-            errors
+            "errors",
+            ["timestamp", "facility_id", "unit_id", "unit_model", "error_code", "severity", "error_message"],
+            errors,
         )
 
         # Insert connectivity
         print(f"Inserting {len(connectivity)} connectivity records...")
-        execute_values(
+        copy_rows(
             cursor,
-            """
-            INSERT INTO connectivity
-            (timestamp, facility_id, unit_id, connectivity_status, disconnect_reason)
-            VALUES %s
-            """,
-            connectivity
+            "connectivity",
+            ["timestamp", "facility_id", "unit_id", "connectivity_status", "disconnect_reason"],
+            connectivity,
         )
 
         # Insert data quality
         print(f"Inserting {len(data_quality)} data quality records...")
-        execute_values(
+        copy_rows(
             cursor,
-            """
-            INSERT INTO data_quality
-            (timestamp, facility_id, data_quality_score, missing_records, latency_ms)
-            VALUES %s
-            """,
-            data_quality
+            "data_quality",
+            ["timestamp", "facility_id", "data_quality_score", "missing_records", "latency_ms"],
+            data_quality,
         )
 
+        # One commit, so the four loads land together or not at all
         conn.commit()
         print("\n✅ Database populated successfully!")
 
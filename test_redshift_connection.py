@@ -25,9 +25,11 @@ def test_connection():
     print("Debug: Raw data from errors table")
     print("=" * 60)
     try:
+        # Runs on the same pooled connection as the queries below
         query_result = data_source._execute_query(
-            "SELECT COUNT(*) as total, severity FROM errors WHERE timestamp >= %s GROUP BY severity",
-            params=[data_source._get_date_filter(30)]
+            "SELECT COUNT(*) as total, severity FROM errors"
+            " WHERE timestamp >= DATEADD(day, -%s, GETDATE()) GROUP BY severity",
+            params=(30,)
         )
         print(f"Raw query result: {query_result}")
     except Exception as e:
@@ -74,6 +76,8 @@ def test_connection():
     print("  - 'Give me a summary of facility FAC001'")
     print("=" * 60)
 
+    data_source.close()
+
 if __name__ == "__main__":
     try:
         test_connection()
@@ -1,4 +1,5 @@
 """Interactive test script for Trackman/Redshift integration"""
+import asyncio
 import sys
 import os
 from dotenv import load_dotenv
@@ -11,6 +12,34 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'code'))
 
 from backend.batch.utilities.helpers.trackman.data_source_factory import get_data_source
 
+# Row templates, bound once so each row costs a single format call
+FACILITY_ERRORS_ROW = "   Facility: {0}, Count: {1}, Unique Errors: {3}".format
+ERRORS_ROW = "   Count: {1}, Unique Errors: {3}".format
+TOP_ERRORS_ROW = "   Error: {0}, Message: {1}, Count: {2}".format
+CONNECTIVITY_ROW = "   Facility: {0}, Online: {1}, Offline: {2}".format
+DASHBOARD_ROW = "      {}".format
+
+
+async def load_dashboard(data_source, facility_id="FAC001", range_days=30):
+    """Run the independent dashboard queries concurrently, each on a worker thread.
+
+    On Redshift each query borrows its own pooled connection, so the wait is
+    the slowest query rather than the sum of all four.
+    """
+    return await asyncio.gather(
+        asyncio.to_thread(data_source.get_errors_summary, range_days=range_days),
+        asyncio.to_thread(data_source.get_connectivity_summary, range_days=range_days),
+        asyncio.to_thread(data_source.get_top_error_messages, range_days=range_days, limit=5),
+        asyncio.to_thread(data_source.get_facility_summary, facility_id, range_days=range_days),
+    )
+
+
+def print_rows(rows, template):
+    """Print template(*row) for each row in one write rather than a print call per row."""
+    if rows:
+        sys.stdout.write("\n".join([template(*row) for row in rows]) + "\n")
+
+
 def main():
     print("\n" + "="*70)
     print("🎯 Trackman Data Integration - Interactive Test")
@@ -31,12 +60,13 @@ def main():
         print("  5. Show facility summary for FAC002")
         print("  6. Show top error messages")
         print("  7. Show connectivity summary")
-        print("  8. Quit")
+        print("  8. Show dashboard (errors, connectivity, top errors, FAC001 summary)")
+        print("  9. Quit")
         print("-"*70)
 
-        choice = input("\nEnter your choice (1-8): ").strip()
+        choice = input("\nEnter your choice (1-9): ").strip()
 
-        if choice == '8':
+        if choice == '9':
             print("\n👋 Goodbye!")
             break
 
@@ -45,22 +75,19 @@ def main():
                 print("\n📊 All Errors (last 30 days):")
                 result = data_source.get_errors_summary(range_days=30)
                 print(f"   Rows returned: {result.get('metadata', {}).get('rowCount', 0)}")
-                for row in result.get('rows', []):
-                    print(f"   Facility: {row[0]}, Count: {row[1]}, Unique Errors: {row[3]}")
+                print_rows(result.get('rows', []), FACILITY_ERRORS_ROW)
 
             elif choice == '2':
                 print("\n📊 Errors for FAC001:")
                 result = data_source.get_errors_summary(range_days=30, facility_id="FAC001")
                 print(f"   Rows returned: {result.get('metadata', {}).get('rowCount', 0)}")
-                for row in result.get('rows', []):
-                    print(f"   Count: {row[1]}, Unique Errors: {row[3]}")
+                print_rows(result.get('rows', []), ERRORS_ROW)
 
             elif choice == '3':
                 print("\n📊 Errors for FAC002:")
                 result = data_source.get_errors_summary(range_days=30, facility_id="FAC002")
                 print(f"   Rows returned: {result.get('metadata', {}).get('rowCount', 0)}")
-                for row in result.get('rows', []):
-                    print(f"   Count: {row[1]}, Unique Errors: {row[3]}")
+                print_rows(result.get('rows', []), ERRORS_ROW)
 
             elif choice == '4':
                 print("\n🏢 Facility Summary for FAC001:")
@@ -76,15 +103,22 @@ def main():
                 print("\n🔝 Top Error Messages:")
                 result = data_source.get_top_error_messages(range_days=30, limit=10)
                 print(f"   Rows returned: {result.get('metadata', {}).get('rowCount', 0)}")
-                for row in result.get('rows', []):
-                    print(f"   Error: {row[0]}, Message: {row[1]}, Count: {row[2]}")
+                print_rows(result.get('rows', []), TOP_ERRORS_ROW)
 
             elif choice == '7':
                 print("\n🔌 Connectivity Summary:")
                 result = data_source.get_connectivity_summary(range_days=30)
                 print(f"   Rows returned: {result.get('metadata', {}).get('rowCount', 0)}")
-                for row in result.get('rows', []):
-                    print(f"   Facility: {row[0]}, Online: {row[1]}, Offline: {row[2]}")
+                print_rows(result.get('rows', []), CONNECTIVITY_ROW)
+
+            elif choice == '8':
+                print("\n📋 Dashboard (last 30 days):")
+                results = asyncio.run(load_dashboard(data_source))
+                for title, result in zip(
+                    ["Errors", "Connectivity", "Top error messages", "FAC001 summary"], results
+                ):
+                    print(f"   {title}: {result.get('metadata', {}).get('rowCount', 0)} rows")
+                    print_rows([(row,) for row in result.get('rows', [])], DASHBOARD_ROW)
 
             else:
                 print("\n❌ Invalid choice. Please try again.")
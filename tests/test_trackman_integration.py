@@ -4,6 +4,7 @@ Can run against Excel source or mock Redshift connection.
 """
 
 import os
+import shutil
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -16,65 +17,95 @@ sys.path.append(str(Path(__file__).parent.parent / "code"))
 
 from backend.batch.utilities.helpers.trackman.data_source_factory import get_data_source
 from backend.batch.utilities.helpers.trackman.excel_data_source import ExcelDataSource
+from tests.trackman_fakes import FakeConnection  # noqa: E402
+
+REDSHIFT_ENV = {
+    "REDSHIFT_HOST": "test-host",
+    "REDSHIFT_DB": "testdb",
+    "REDSHIFT_USER": "testuser",
+    "REDSHIFT_PASSWORD": "testpass",
+}
+
+
+@pytest.fixture(scope="session")
+def sample_frames():
+    """Sample sheets shared by the in-memory and Excel-backed sources."""
+    import pandas as pd
+
+    # Dates relative to today so every test's date range covers them
+    timestamps = pd.date_range(end=pd.Timestamp.now().normalize(), periods=10, freq="D")
+
+    # Create sample data
+    errors_data = pd.DataFrame({
+        "timestamp": timestamps,
+        "facility_id": ["FAC001"] * 5 + ["FAC002"] * 5,
+        "unit_id": ["U001", "U002"] * 5,
+        "unit_model": ["TrackMan 4"] * 10,
+        "error_code": ["E001", "E002", "E003"] * 3 + ["E001"],
+        "severity": ["LOW", "MEDIUM", "HIGH"] * 3 + ["CRITICAL"],
+        "error_message": ["Test error"] * 10,
+    })
+
+    connectivity_data = pd.DataFrame({
+        "timestamp": timestamps,
+        "facility_id": ["FAC001"] * 10,
+        "unit_id": ["U001"] * 10,
+        "connectivity_status": ["ONLINE"] * 8 + ["OFFLINE"] * 2,
+        "disconnect_reason": [None] * 8 + ["Network timeout", "Power loss"],
+    })
+
+    facility_data = pd.DataFrame({
+        "facility_id": ["FAC001", "FAC002"],
+        "location": ["New York", "Los Angeles"],
+        "opening_hours": ["9am-9pm", "8am-10pm"],
+        "subscription_status": ["ACTIVE", "ACTIVE"],
+        "units_deployed": [5, 3],
+        "usage_hours_30d": [245.5, 180.0],
+        "strokes_tracked": [125000, 89000],
+        "tournaments_hosted": [8, 5],
+    })
+
+    quality_data = pd.DataFrame({
+        "timestamp": timestamps,
+        "facility_id": ["FAC001"] * 10,
+        "data_quality_score": [85.0, 90.0, 88.0, 92.0, 87.0] * 2,
+        "missing_records": [5, 3, 4, 2, 6] * 2,
+        "latency_ms": [45.0, 38.0, 42.0, 35.0, 50.0] * 2,
+    })
+
+    return {
+        "errors": errors_data,
+        "connectivity": connectivity_data,
+        "facility_metadata": facility_data,
+        "data_quality": quality_data,
+    }
+
+
+@pytest.fixture(scope="session")
+def sample_workbook(tmp_path_factory, sample_frames):
+    """Write the test Excel file once for the whole session."""
+    import pandas as pd
+
+    excel_path = tmp_path_factory.mktemp("workbook") / "test_data.xlsx"
+    with pd.ExcelWriter(excel_path, engine="xlsxwriter", mode="w") as writer:
+        for sheet_name, df in sample_frames.items():
+            df.to_excel(writer, sheet_name=sheet_name, index=False)
+
+    return excel_path
 
 
 class TestExcelDataSource:
     """Test Excel data source implementation."""
 
     @pytest.fixture
-    def data_dir(self, tmp_path):
-        """Create temporary directory with test Excel file."""
-        import pandas as pd
+    def data_dir(self, tmp_path, sample_workbook):
+        """Create temporary directory with a copy of the test Excel file.
 
+        Each test gets its own directory, since some modify the file or its cache.
+        """
         test_dir = tmp_path / "testdata"
         test_dir.mkdir()
-
-        # Create sample data
-        errors_data = pd.DataFrame({
-            "timestamp": pd.date_range(start="2026-01-01", periods=10, freq="D"),
-            "facility_id": ["FAC001"] * 5 + ["FAC002"] * 5,
-            "unit_id": ["U001", "U002"] * 5,
-            "unit_model": ["TrackMan 4"] * 10,
-            "error_code": ["E001", "E002", "E003"] * 3 + ["E001"],
-            "severity": ["LOW", "MEDIUM", "HIGH"] * 3 + ["CRITICAL"],
-            "error_message": ["Test error"] * 10,
-        })
-
-        connectivity_data = pd.DataFrame({
-            "timestamp": pd.date_range(start="2026-01-01", periods=10, freq="D"),
-            "facility_id": ["FAC001"] * 10,
-            "unit_id": ["U001"] * 10,
-            "connectivity_status": ["ONLINE"] * 8 + ["OFFLINE"] * 2,
-            "disconnect_reason": [None] * 8 + ["Network timeout", "Power loss"],
-        })
-
-        facility_data = pd.DataFrame({
-            "facility_id": ["FAC001", "FAC002"],
-            "location": ["New York", "Los Angeles"],
-            "opening_hours": ["9am-9pm", "8am-10pm"],
-            "subscription_status": ["ACTIVE", "ACTIVE"],
-            "units_deployed": [5, 3],
-            "usage_hours_30d": [245.5, 180.0],
-            "strokes_tracked": [125000, 89000],
-            "tournaments_hosted": [8, 5],
-        })
-
-        quality_data = pd.DataFrame({
-            "timestamp": pd.date_range(start="2026-01-01", periods=10, freq="D"),
-            "facility_id": ["FAC001"] * 10,
-            "data_quality_score": [85.0, 90.0, 88.0, 92.0, 87.0] * 2,
-            "missing_records": [5, 3, 4, 2, 6] * 2,
-            "latency_ms": [45.0, 38.0, 42.0, 35.0, 50.0] * 2,
-        })
-
-        # Write to Excel file
-        excel_path = test_dir / "test_data.xlsx"
-        with pd.ExcelWriter(excel_path) as writer:
-            errors_data.to_excel(writer, sheet_name="errors", index=False)
-            connectivity_data.to_excel(writer, sheet_name="connectivity", index=False)
-            facility_data.to_excel(writer, sheet_name="facility_metadata", index=False)
-            quality_data.to_excel(writer, sheet_name="data_quality", index=False)
-
+        shutil.copy(sample_workbook, test_dir / sample_workbook.name)
         return test_dir
 
     def test_excel_source_initialization(self, data_dir):
@@ -85,10 +116,27 @@ class TestExcelDataSource:
         assert len(source._data["connectivity"]) == 10
         assert len(source._data["facility_metadata"]) == 2
         assert len(source._data["data_quality"]) == 10
-
-    def test_get_errors_summary(self, data_dir):
+        assert source.row_counts() == {
+            "errors": 10, "connectivity": 10, "facility_metadata": 2, "data_quality": 10
+        }
+        assert source.cache_dir == data_dir / ".cache"
+
+    def test_from_frames_matches_excel(self, data_dir, sample_frames):
+        """Test in-memory sheets are typed and queried like the Excel file."""
+        from_excel = ExcelDataSource(data_dir=str(data_dir))
+        from_frames = ExcelDataSource.from_frames(sample_frames)
+
+        # Excel stores whole floats as integers, so only non-numeric dtypes match
+        for sheet_name, df in from_excel._data.items():
+            for col in df.select_dtypes(exclude="number").columns:
+                assert from_frames._data[sheet_name][col].dtype == df[col].dtype
+        assert from_frames.get_facility_summary("FAC001", 3650) == from_excel.get_facility_summary("FAC001", 3650)
+        assert from_frames.get_errors_summary(3650) == from_excel.get_errors_summary(3650)
+        assert from_frames.refresh() is False
+
+    def test_get_errors_summary(self, sample_frames):
         """Test errors summary query."""
-        source = ExcelDataSource(data_dir=str(data_dir))
+        source = ExcelDataSource.from_frames(sample_frames)
 
         result = source.get_errors_summary(range_days=30)
 
@@ -98,22 +146,24 @@ class TestExcelDataSource:
         assert result["metadata"]["source"] == "excel"
         assert len(result["rows"]) > 0
 
-    def test_get_errors_summary_with_facility_filter(self, data_dir):
+    def test_get_errors_summary_with_facility_filter(self, sample_frames):
         """Test errors summary with facility filter."""
-        source = ExcelDataSource(data_dir=str(data_dir))
+        source = ExcelDataSource.from_frames(sample_frames)
 
         result = source.get_errors_summary(range_days=30, facility_id="FAC001")
 
-        assert len(result["rows"]) == 5  # Only FAC001 errors
+        # One summary row, counting only the 5 FAC001 errors
+        assert len(result["rows"]) == 1
+        assert result["rows"][0][result["columns"].index("error_count")] == 5
 
         # Verify all rows are for FAC001
         facility_col_idx = result["columns"].index("facility_id")
         for row in result["rows"]:
             assert row[facility_col_idx] == "FAC001"
 
-    def test_get_top_error_messages(self, data_dir):
+    def test_get_top_error_messages(self, sample_frames):
         """Test top error messages query."""
-        source = ExcelDataSource(data_dir=str(data_dir))
+        source = ExcelDataSource.from_frames(sample_frames)
 
         result = source.get_top_error_messages(range_days=30, limit=5)
 
@@ -121,24 +171,350 @@ class TestExcelDataSource:
         assert "error_code" in result["columns"]
         assert "count" in result["columns"]
 
-    def test_get_connectivity_summary(self, data_dir):
+    def test_get_top_error_messages_counts(self, sample_frames):
+        """Test top error messages are counted per message and code."""
+        source = ExcelDataSource.from_frames(sample_frames)
+
+        result = source.get_top_error_messages(range_days=3650, limit=2)
+
+        assert result["columns"] == ["error_message", "error_code", "count", "severity"]
+        assert result["rows"][0][1:3] == ["E001", 4]
+        assert len(result["rows"]) == 2
+
+    def test_get_connectivity_summary(self, sample_frames):
         """Test connectivity summary."""
-        source = ExcelDataSource(data_dir=str(data_dir))
+        source = ExcelDataSource.from_frames(sample_frames)
 
         result = source.get_connectivity_summary(range_days=30)
 
-        assert "connectivity_status" in result["columns"]
+        assert "connected_pct" in result["columns"]
         assert len(result["rows"]) > 0
 
-    def test_get_facility_summary(self, data_dir):
+    def test_get_disconnect_reasons(self, tmp_path):
+        """Test disconnect reasons are counted for disconnected events only."""
+        import pandas as pd
+
+        connectivity_data = pd.DataFrame({
+            "timestamp": pd.date_range(end=datetime.now(), periods=6, freq="h"),
+            "facility_id": ["FAC001"] * 6,
+            "unit_id": ["U001"] * 6,
+            "connectivity_status": ["disconnected"] * 5 + ["connected"],
+            "disconnect_reason": ["Power loss", "Network timeout", "Power loss", None, "Power loss", "Stale"],
+        })
+        connectivity_data.to_excel(tmp_path / "conn.xlsx", sheet_name="connectivity", index=False)
+
+        source = ExcelDataSource(data_dir=str(tmp_path))
+        result = source.get_disconnect_reasons(range_days=7)
+
+        assert result["columns"] == ["disconnect_reason", "count", "percentage"]
+        assert result["rows"] == [["Power loss", 3, 75.0], ["Network timeout", 1, 25.0]]
+
+    def test_get_facility_summary(self, sample_frames):
         """Test facility summary."""
-        source = ExcelDataSource(data_dir=str(data_dir))
+        source = ExcelDataSource.from_frames(sample_frames)
 
         result = source.get_facility_summary(facility_id="FAC001", range_days=30)
 
         assert "metadata" in result
         assert len(result["rows"]) > 0
 
+    def test_get_facility_summary_metrics(self, sample_frames):
+        """Test facility summary metrics computed from indexed rows."""
+        source = ExcelDataSource.from_frames(sample_frames)
+
+        result = source.get_facility_summary(facility_id="FAC001", range_days=3650)
+        metrics = dict(result["rows"])
+
+        assert metrics["location"] == "New York"
+        assert metrics["errors_total"] == 5
+        assert metrics["errors_critical"] == 0
+        assert metrics["connectivity_pct"] == 0.0
+        assert metrics["avg_data_quality_score"] == 88.4
+
+    def test_columnar_cache_reused(self, data_dir):
+        """Test unchanged Excel files are served from the Arrow IPC cache."""
+        ExcelDataSource(data_dir=str(data_dir))
+        assert len(list((data_dir / ".cache").glob("errors_*.arrow"))) == 1
+
+        # Corrupt the workbook but keep its mtime: only a cache hit can still load it
+        excel_path = data_dir / "test_data.xlsx"
+        stat = excel_path.stat()
+        excel_path.write_bytes(b"not an excel file")
+        os.utime(excel_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        source = ExcelDataSource(data_dir=str(data_dir))
+
+        assert len(source._data["errors"]) == 10
+        assert len(source._data["facility_metadata"]) == 2
+
+    def test_columnar_cache_invalidated_on_change(self, data_dir):
+        """Test a modified Excel file replaces the stale cache entry."""
+        ExcelDataSource(data_dir=str(data_dir))
+        stale = list((data_dir / ".cache").glob("errors_*.arrow"))
+
+        excel_path = data_dir / "test_data.xlsx"
+        stat = excel_path.stat()
+        os.utime(excel_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        source = ExcelDataSource(data_dir=str(data_dir))
+        current = list((data_dir / ".cache").glob("errors_*.arrow"))
+
+        assert len(source._data["errors"]) == 10
+        assert len(current) == 1
+        assert current != stale
+
+    def test_failed_parse_not_cached(self, data_dir, sample_workbook):
+        """Test a workbook that fails to parse is retried rather than cached as empty."""
+        excel_path = data_dir / "test_data.xlsx"
+        stat = excel_path.stat()
+        excel_path.write_bytes(b"still being copied")
+        os.utime(excel_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        source = ExcelDataSource(data_dir=str(data_dir))
+        assert source._data["errors"].empty
+        assert not list((data_dir / ".cache").glob("*.arrow"))
+
+        # The finished file keeps the same mtime, so only a fresh parse can load it
+        shutil.copy(sample_workbook, excel_path)
+        os.utime(excel_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert len(ExcelDataSource(data_dir=str(data_dir))._data["errors"]) == 10
+        assert source.refresh() is True
+        assert len(source._data["errors"]) == 10
+
+    def test_parser_pool_failure_falls_back_to_in_process(self, data_dir, sample_workbook):
+        """Test files are still parsed when the worker pool cannot run."""
+        from concurrent.futures.process import BrokenProcessPool
+
+        shutil.copy(sample_workbook, data_dir / "more_data.xlsx")
+
+        with patch(
+            "backend.batch.utilities.helpers.trackman.excel_data_source.ProcessPoolExecutor",
+            side_effect=BrokenProcessPool("workers could not start"),
+        ):
+            source = ExcelDataSource(data_dir=str(data_dir))
+
+        assert len(source._data["errors"]) == 10
+
+    def test_failed_load_retried_on_refresh(self, data_dir):
+        """Test a load that failed is not kept as the current data."""
+        with patch.object(ExcelDataSource, "_merge_frames", side_effect=MemoryError):
+            source = ExcelDataSource(data_dir=str(data_dir))
+        assert source._data["errors"].empty
+
+        assert source.refresh() is True
+        assert len(source._data["errors"]) == 10
+
+    def test_rows_indexed_by_time_and_facility(self, sample_frames):
+        """Test sheets are time-sorted and filtered through the facility index."""
+        source = ExcelDataSource.from_frames(sample_frames)
+
+        assert source._data["errors"]["timestamp"].is_monotonic_increasing
+
+        rows = source._select_rows(source._state, "errors", 3650, "FAC002")
+        assert len(rows) == 5
+        assert set(rows["facility_id"]) == {"FAC002"}
+        assert source._select_rows(source._state, "errors", 3650, "FAC999").empty
+        assert source._select_rows(source._state, "errors", 0, None).empty
+
+    def test_query_results_cached(self, sample_frames):
+        """Test identical queries are answered from the result cache."""
+        source = ExcelDataSource.from_frames(sample_frames)
+
+        first = source.get_errors_summary(3650, "FAC001")
+        first["rows"].clear()
+
+        with patch.object(source, "_row_selector") as mock_select:
+            second = source.get_errors_summary(range_days=3650, facility_id="FAC001")
+
+        mock_select.assert_not_called()
+        assert len(second["rows"]) == 1
+
+    def test_query_reads_one_state_across_reload(self, sample_frames):
+        """Test a reload during a query does not mix old and new frames and indexes."""
+        source = ExcelDataSource.from_frames(sample_frames)
+        get_facility_summary = ExcelDataSource.get_facility_summary.__wrapped__
+        expected = get_facility_summary(source, "FAC001", 3650)
+
+        fewer_rows = {name: df.iloc[:2] for name, df in sample_frames.items()}
+        facility_positions = source._facility_positions
+
+        def reload_midway(*args):
+            source._build_indexes(source._merge_frames({Path("reloaded"): fewer_rows}))
+            return facility_positions(*args)
+
+        with patch.object(source, "_facility_positions", side_effect=reload_midway):
+            result = get_facility_summary(source, "FAC001", 3650)
+
+        assert result == expected
+        assert len(source._data["errors"]) == 2
+
+    def test_range_cutoff_is_range_days_before_now(self):
+        """Test the date range starts exactly range_days before the current time."""
+        import pandas as pd
+
+        cutoff = pd.Timestamp.now() - pd.Timedelta(days=1)
+        source = ExcelDataSource.from_frames({
+            "errors": pd.DataFrame({
+                "timestamp": [cutoff - pd.Timedelta(minutes=1), cutoff + pd.Timedelta(minutes=1)],
+                "facility_id": ["FAC001"] * 2,
+                "error_code": ["E001"] * 2,
+                "severity": ["LOW"] * 2,
+                "error_message": ["Test error"] * 2,
+            })
+        })
+
+        result = source.get_errors_summary(range_days=1)
+
+        assert result["rows"][0][result["columns"].index("error_count")] == 1
+
+    def test_query_results_expire_after_ttl(self, sample_frames):
+        """Test cached results are recomputed once TRACKMAN_CACHE_TTL seconds pass."""
+        source = ExcelDataSource.from_frames(sample_frames)
+
+        with patch.dict(os.environ, {"TRACKMAN_CACHE_TTL": "60"}), \
+                patch("time.time", return_value=1_000_000.0):
+            source.get_errors_summary(range_days=7)
+            with patch.object(source, "_row_selector", wraps=source._row_selector) as mock_select:
+                source.get_errors_summary(range_days=7)
+            mock_select.assert_not_called()
+
+        with patch.dict(os.environ, {"TRACKMAN_CACHE_TTL": "60"}), \
+                patch("time.time", return_value=1_000_060.0), \
+                patch.object(source, "_row_selector", wraps=source._row_selector) as mock_select:
+            source.get_errors_summary(range_days=7)
+
+        mock_select.assert_called_once()
+
+    def test_low_cardinality_columns_categorical(self, sample_frames):
+        """Test low-cardinality columns are stored as categoricals."""
+        import pandas as pd
+
+        source = ExcelDataSource.from_frames(sample_frames)
+
+        assert isinstance(source._data["errors"]["severity"].dtype, pd.CategoricalDtype)
+        assert isinstance(source._data["errors"]["facility_id"].dtype, pd.CategoricalDtype)
+
+        result = source.get_errors_summary(range_days=3650)
+        facility_col_idx = result["columns"].index("facility_id")
+        assert {row[facility_col_idx] for row in result["rows"]} == {"FAC001", "FAC002"}
+
+    def test_free_text_columns_arrow_backed(self, data_dir):
+        """Test free-text columns use Arrow strings, also when loaded from cache."""
+        import pandas as pd
+
+        for source in (ExcelDataSource(data_dir=str(data_dir)), ExcelDataSource(data_dir=str(data_dir))):
+            assert source._data["errors"]["error_message"].dtype == pd.StringDtype("pyarrow")
+            assert source._data["facility_metadata"]["location"].dtype == pd.StringDtype("pyarrow")
+
+    def test_only_allowlisted_columns_loaded(self, tmp_path):
+        """Test unknown columns are skipped and IDs are read as strings."""
+        import pandas as pd
+
+        quality_data = pd.DataFrame({
+            "timestamp": pd.date_range(start="2026-01-01", periods=3, freq="D"),
+            "facility_id": [101, 102, 103],
+            "data_quality_score": [85.0, 90.0, 88.0],
+            "missing_records": [5, 3, 4],
+            "latency_ms": [45.0, 38.0, 42.0],
+            "internal_notes": ["a", "b", "c"],
+        })
+        quality_data.to_excel(tmp_path / "quality.xlsx", sheet_name="data_quality", index=False)
+
+        source = ExcelDataSource(data_dir=str(tmp_path))
+        df = source._data["data_quality"]
+
+        assert "internal_notes" not in df.columns
+        assert list(df["facility_id"]) == ["101", "102", "103"]
+        assert pd.api.types.is_datetime64_any_dtype(df["timestamp"])
+
+    def test_timestamps_with_mixed_precision_loaded(self, tmp_path):
+        """Test whole-second timestamps survive next to fractional ones."""
+        import pandas as pd
+
+        timestamps = [pd.Timestamp("2026-01-01 10:00:00.250"), pd.Timestamp("2026-01-02 11:30:00")]
+        pd.DataFrame({
+            "timestamp": timestamps,
+            "facility_id": ["FAC001", "FAC001"],
+            "data_quality_score": [85.0, 90.0],
+            "missing_records": [5, 3],
+            "latency_ms": [45.0, 38.0],
+        }).to_excel(tmp_path / "quality.xlsx", sheet_name="data_quality", index=False)
+
+        source = ExcelDataSource(data_dir=str(tmp_path))
+
+        assert list(source._data["data_quality"]["timestamp"]) == list(timestamps)
+
+    def test_refresh_reparses_only_changed_files(self, tmp_path):
+        """Test refresh reloads modified files and reuses the others."""
+        import pandas as pd
+
+        from backend.batch.utilities.helpers.trackman import excel_data_source
+
+        def write_errors(path, facility_id, periods):
+            pd.DataFrame({
+                "timestamp": pd.date_range(end=datetime.now(), periods=periods, freq="h"),
+                "facility_id": [facility_id] * periods,
+                "unit_id": ["U001"] * periods,
+                "unit_model": ["TrackMan 4"] * periods,
+                "error_code": ["E001"] * periods,
+                "severity": ["critical"] * periods,
+                "error_message": ["Error"] * periods,
+            }).to_excel(path, sheet_name="errors", index=False)
+
+        write_errors(tmp_path / "a.xlsx", "FAC001", 2)
+        write_errors(tmp_path / "b.xlsx", "FAC002", 3)
+        source = ExcelDataSource(data_dir=str(tmp_path))
+        assert source.get_errors_summary(range_days=7)["rows"] == [
+            ["FAC001", 2, 2, 1],
+            ["FAC002", 3, 3, 1],
+        ]
+        assert source.refresh() is False
+
+        write_errors(tmp_path / "b.xlsx", "FAC002", 4)
+        stat = (tmp_path / "b.xlsx").stat()
+        os.utime(tmp_path / "b.xlsx", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        with patch.object(
+            excel_data_source, "_parse_workbook", wraps=excel_data_source._parse_workbook
+        ) as mock_parse:
+            assert source.refresh() is True
+
+        mock_parse.assert_called_once_with(tmp_path / "b.xlsx")
+        assert source.get_errors_summary(range_days=7)["rows"] == [
+            ["FAC001", 2, 2, 1],
+            ["FAC002", 4, 4, 1],
+        ]
+
+    def test_new_source_reuses_parsed_workbooks(self, tmp_path):
+        """Test a second source in the process does not parse unchanged files again."""
+        import pandas as pd
+
+        from backend.batch.utilities.helpers.trackman import excel_data_source
+
+        pd.DataFrame({
+            "facility_id": ["FAC001"],
+            "location": ["New York"],
+        }).to_excel(tmp_path / "meta.xlsx", sheet_name="facility_metadata", index=False)
+
+        excel_data_source.clear_workbook_cache()
+        ExcelDataSource(data_dir=str(tmp_path))
+        # Without the columnar cache the next source would have to parse again
+        shutil.rmtree(tmp_path / ".cache")
+
+        with patch.object(
+            excel_data_source, "_parse_workbook", wraps=excel_data_source._parse_workbook
+        ) as mock_parse:
+            source = ExcelDataSource(data_dir=str(tmp_path))
+            mock_parse.assert_not_called()
+
+            excel_data_source.clear_workbook_cache()
+            shutil.rmtree(tmp_path / ".cache")
+            ExcelDataSource(data_dir=str(tmp_path))
+            mock_parse.assert_called_once_with(tmp_path / "meta.xlsx")
+
+        assert list(source._data["facility_metadata"]["facility_id"]) == ["FAC001"]
+
     def test_multiple_excel_files(self, tmp_path):
         """Test merging data from multiple Excel files."""
         import pandas as pd
@@ -168,10 +544,10 @@ class TestExcelDataSource:
         })
 
         # Write to separate files
-        with pd.ExcelWriter(test_dir / "file1.xlsx") as writer:
+        with pd.ExcelWriter(test_dir / "file1.xlsx", engine="xlsxwriter", mode="w") as writer:
             errors1.to_excel(writer, sheet_name="errors", index=False)
 
-        with pd.ExcelWriter(test_dir / "file2.xlsx") as writer:
+        with pd.ExcelWriter(test_dir / "file2.xlsx", engine="xlsxwriter", mode="w") as writer:
             errors2.to_excel(writer, sheet_name="errors", index=False)
 
         # Load and verify merge
@@ -179,6 +555,49 @@ class TestExcelDataSource:
 
         assert len(source._data["errors"]) == 10  # Should have merged both
 
+    def test_rows_repeated_across_files_deduplicated(self, tmp_path):
+        """Test rows repeated across files are dropped and differing rows kept."""
+        import pandas as pd
+
+        metadata = pd.DataFrame({
+            "facility_id": ["FAC001", "FAC002"],
+            "location": ["New York", "Los Angeles"],
+            "subscription_status": ["ACTIVE", "ACTIVE"],
+        })
+        metadata.to_excel(tmp_path / "a.xlsx", sheet_name="facility_metadata", index=False)
+        metadata.iloc[[1]].to_excel(tmp_path / "b.xlsx", sheet_name="facility_metadata", index=False)
+
+        source = ExcelDataSource(data_dir=str(tmp_path))
+        df = source._data["facility_metadata"]
+
+        assert sorted(df["facility_id"]) == ["FAC001", "FAC002"]
+
+    def test_rows_sharing_key_fields_not_deduplicated(self, tmp_path):
+        """Test distinct rows sharing timestamp, facility, unit and code survive any file count."""
+        import pandas as pd
+
+        now = pd.Timestamp.now().floor("s")
+        errors = pd.DataFrame({
+            "timestamp": [now, now, now, now],
+            "facility_id": ["FAC001"] * 4,
+            "unit_id": ["UNIT01"] * 4,
+            "error_code": ["E001"] * 4,
+            "error_message": ["Sensor offline", "Sensor offline", "Sensor failure", "Sensor failure"],
+            "severity": ["warning", "warning", "critical", "critical"],
+        })
+        errors.to_excel(tmp_path / "a.xlsx", sheet_name="errors", index=False)
+
+        single = ExcelDataSource(data_dir=str(tmp_path)).get_errors_summary(range_days=7)
+
+        errors.assign(facility_id="FAC002").to_excel(tmp_path / "b.xlsx", sheet_name="errors", index=False)
+        merged = ExcelDataSource(data_dir=str(tmp_path)).get_errors_summary(
+            range_days=7, facility_id="FAC001"
+        )
+
+        # Exact duplicates are dropped; the critical row sharing the key is kept
+        assert single["rows"] == [["FAC001", 2, 1, 1]]
+        assert merged["rows"] == single["rows"]
+
 
 class TestDataSourceFactory:
     """Test data source factory."""
@@ -196,56 +615,328 @@ class TestDataSourceFactory:
             source = get_data_source()
             assert isinstance(source, ExcelDataSource)
 
+    def test_factory_builds_once_under_concurrency(self):
+        """Test concurrent first calls share a single data source instance."""
+        import threading
+        import time
+        from concurrent.futures import ThreadPoolExecutor
+
+        from backend.batch.utilities.helpers.trackman import data_source_factory
+
+        calls = []
+        start = threading.Barrier(8)
+
+        def slow_source():
+            calls.append(1)
+            time.sleep(0.05)
+            return Mock()
+
+        def first_call():
+            start.wait()
+            return get_data_source()
+
+        data_source_factory.reset_data_source()
+        try:
+            with patch.dict(os.environ, {"USE_REDSHIFT": "false"}, clear=False), \
+                    patch.object(data_source_factory, "ExcelDataSource", side_effect=slow_source):
+                with ThreadPoolExecutor(max_workers=8) as pool:
+                    sources = list(pool.map(lambda _: first_call(), range(8)))
+        finally:
+            data_source_factory.reset_data_source()
+
+        assert len(calls) == 1
+        assert all(source is sources[0] for source in sources)
+
+    def test_reset_closes_previous_source(self):
+        """Verify resetting the singleton releases the old source's resources."""
+        from backend.batch.utilities.helpers.trackman import data_source_factory
+
+        data_source_factory.reset_data_source()
+        with patch.dict(os.environ, {"USE_REDSHIFT": "false"}, clear=False), \
+                patch.object(data_source_factory, "ExcelDataSource", return_value=Mock()):
+            source = get_data_source()
+            data_source_factory.reset_data_source()
+
+        source.close.assert_called_once_with()
+
 
 class TestRedshiftDataSource:
     """Test Redshift data source with mocked connection."""
 
     @pytest.fixture
     def mock_redshift_connection(self):
-        """Mock Redshift connection."""
-        with patch("backend.batch.utilities.helpers.trackman.redshift_data_source.psycopg2") as mock_pg:
-            mock_conn = Mock()
-            mock_cursor = Mock()
-
-            mock_pg.connect.return_value = mock_conn
-            mock_conn.cursor.return_value = mock_cursor
-
-            # Mock query results
-            mock_cursor.fetchall.return_value = [
-                ("FAC001", 10, "HIGH"),
-                ("FAC002", 5, "MEDIUM"),
-            ]
-            mock_cursor.description = [
-                Mock(name="facility_id"),
-                Mock(name="error_count"),
-                Mock(name="severity"),
-            ]
-
-            yield mock_pg, mock_cursor
+        """Fake Redshift connection returned by psycopg2.connect."""
+        conn = FakeConnection(
+            [("FAC001", 10, "HIGH"), ("FAC002", 5, "MEDIUM")],
+            columns=("facility_id", "error_count", "severity"),
+        )
+        with patch("psycopg2.connect", return_value=conn):
+            yield conn
 
     def test_redshift_connection_uses_parameterized_queries(self, mock_redshift_connection):
         """Verify Redshift source uses parameterized queries."""
         from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
 
-        mock_pg, mock_cursor = mock_redshift_connection
+        with patch.dict(os.environ, REDSHIFT_ENV):
+            source = RedshiftDataSource()
+            source.get_errors_summary(range_days=7, facility_id="FAC001")
+            source.close()
+
+        # The SQL carries %s placeholders and the values travel separately
+        query, params = mock_redshift_connection.executed[-1]
+        assert "%s" in repr(query)
+        assert "FAC001" not in repr(query)
+        assert params == (7, "FAC001", "FAC001")
+
+    def test_redshift_connections_pooled(self):
+        """Verify repeated queries reuse one pooled connection."""
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
 
-        with patch.dict(os.environ, {
-            "REDSHIFT_HOST": "test-host",
-            "REDSHIFT_DB": "testdb",
-            "REDSHIFT_USER": "testuser",
-            "REDSHIFT_PASSWORD": "testpass",
-        }):
+        conn = FakeConnection(
+            [("FAC001", 10, 2, 3)],
+            columns=("facility_id", "error_count", "critical_count", "unique_errors"),
+        )
+
+        with patch("psycopg2.connect", return_value=conn) as mock_connect, \
+                patch.dict(os.environ, REDSHIFT_ENV):
+            source = RedshiftDataSource()
+            source.get_errors_summary(range_days=7)
+            source.get_errors_summary(range_days=30)
+            source.close()
+
+        assert mock_connect.call_count == 1
+        assert mock_connect.call_args.kwargs["keepalives"] == 1
+        assert len(conn.executed) == 2
+
+    def test_redshift_queries_wait_for_free_pooled_connection(self):
+        """Verify queries beyond REDSHIFT_POOL_MAX wait instead of failing."""
+        import threading
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
+
+        conn = FakeConnection(
+            [("FAC001", 10, 2, 3)],
+            columns=("facility_id", "error_count", "critical_count", "unique_errors"),
+        )
+        results = []
+
+        with patch("psycopg2.connect", return_value=conn), \
+                patch.dict(os.environ, {**REDSHIFT_ENV, "REDSHIFT_POOL_MAX": "1"}):
+            source = RedshiftDataSource()
+            pool, held = source._get_connection()
+            query = threading.Thread(
+                target=lambda: results.append(source.get_errors_summary(range_days=7))
+            )
+            query.start()
+            query.join(timeout=0.2)
+            assert query.is_alive()
+
+            source._release_connection(pool, held)
+            query.join(timeout=5)
+            source.close()
+
+        assert results[0]["rows"] == [("FAC001", 10, 2, 3)]
+
+    def test_redshift_query_finishing_after_close_keeps_result(self):
+        """Verify a connection released after close() neither fails nor opens a new pool."""
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
+
+        conn = FakeConnection(
+            [("FAC001", 10, 2, 3)],
+            columns=("facility_id", "error_count", "critical_count", "unique_errors"),
+        )
+
+        with patch("psycopg2.connect", return_value=conn) as mock_connect, \
+                patch.dict(os.environ, REDSHIFT_ENV):
             source = RedshiftDataSource()
-            result = source.get_errors_summary(range_days=7, facility_id="FAC001")
+            # Another thread resets the data source while this query is in flight
+            conn.rollback = source.close
+            result = source.get_errors_summary(range_days=7)
+
+        assert result["rows"] == [("FAC001", 10, 2, 3)]
+        assert mock_connect.call_count == 1
+        assert conn.closed
+        assert source._pool is None
+
+    def test_redshift_explicit_config_skips_environment(self):
+        """Verify a source built from a RedshiftConfig does not need REDSHIFT_* vars."""
+        from backend.batch.utilities.helpers.trackman.redshift_config import RedshiftConfig
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
 
-            # Verify execute was called with parameterized query
-            assert mock_cursor.execute.called
-            call_args = mock_cursor.execute.call_args
+        config = RedshiftConfig(
+            host="test-host", database="testdb", user="testuser", password="testpass", schema="ops"
+        )
+
+        with patch.dict(os.environ, {}, clear=True):
+            source = RedshiftDataSource(config)
+
+        assert source.config is config
+        assert "ops" in repr(source._queries["errors_summary"])
+
+    def test_redshift_rejects_tables_missing_from_allowlist(self):
+        """Verify tables are checked against the allowlist when the source is built."""
+        from backend.batch.utilities.helpers.trackman import redshift_data_source
+        from backend.batch.utilities.helpers.trackman.redshift_config import RedshiftConfig
+
+        config = RedshiftConfig(
+            host="test-host", database="testdb", user="testuser", password="testpass"
+        )
+
+        with patch.object(
+            redshift_data_source, "_USED_TABLES", ("errors", "users")
+        ), pytest.raises(ValueError, match="'users' is not in the allowlist"):
+            redshift_data_source.RedshiftDataSource(config)
+
+    def test_redshift_queries_composed_once(self):
+        """Verify queries are composed at construction, not per call."""
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
+
+        conn = FakeConnection(columns=("facility_id",))
+
+        with patch("psycopg2.connect", return_value=conn), \
+                patch.dict(os.environ, REDSHIFT_ENV):
+            source = RedshiftDataSource()
+            with patch(
+                "backend.batch.utilities.helpers.trackman.redshift_data_source.sql.SQL",
+                side_effect=AssertionError("query composed per call"),
+            ):
+                source.get_errors_summary(range_days=7)
+                source.get_errors_summary(range_days=7, facility_id="FAC001")
+                source.get_disconnect_reasons(range_days=7, facility_id="FAC001")
+            source.close()
+
+        params = [params for _, params in conn.executed]
+        # The cutoff is computed by Redshift from range_days
+        assert params[0] == (7, None, None)
+        assert params[1] == (7, "FAC001", "FAC001")
+        assert params[2] == (7, "FAC001", "FAC001")
+
+    def test_redshift_statements_prepared_once_per_connection(self):
+        """Verify queries are prepared once per pooled connection, then executed by name."""
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
 
-            # First argument should be SQL with %s placeholders
-            assert "%s" in call_args[0][0] or "?" in call_args[0][0]
-            # Second argument should be tuple of parameters
-            assert isinstance(call_args[0][1], (tuple, list))
+        conn = FakeConnection(columns=("facility_id",))
+        conn.prepared_statements = set()
+
+        with patch("psycopg2.connect", return_value=conn) as mock_connect, \
+                patch.dict(os.environ, REDSHIFT_ENV):
+            source = RedshiftDataSource()
+            source.get_errors_summary(range_days=7)
+            source.get_errors_summary(range_days=30, facility_id="FAC001")
+            source.get_top_error_messages(range_days=7, limit=5)
+            source.close()
+
+        assert mock_connect.call_args.kwargs["connection_factory"] is not None
+        statements = [repr(query) for query, _ in conn.executed]
+        assert statements[0].startswith("Composed([SQL('PREPARE ')")
+        assert "$3" in statements[0] and "%s" not in statements[0]
+        assert all("EXECUTE" in statement for statement in statements[1:3])
+        # The top errors query binds LIMIT client-side and is sent as text
+        assert "EXECUTE" not in statements[3]
+        assert [params for _, params in conn.executed[1:]] == [
+            (7, None, None),
+            (30, "FAC001", "FAC001"),
+            (7, None, None, 5),
+        ]
+        assert conn.prepared_statements == {"trackman_errors_summary"}
+
+    def test_redshift_connection_discarded_after_failed_prepared_statement(self):
+        """Verify a failed EXECUTE drops the connection instead of trusting its prepared statements."""
+        import psycopg2
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
+        from tests.trackman_fakes import FakeCursor
+
+        failing, fresh = (FakeConnection([("FAC001",)], columns=("facility_id",)) for _ in range(2))
+        failing.prepared_statements, fresh.prepared_statements = set(), set()
+        cursor = FakeCursor(failing)
+        cursor.execute = Mock(side_effect=[None, psycopg2.OperationalError("statement lost")])
+        failing.cursor = lambda: cursor
+
+        with patch("psycopg2.connect", side_effect=[failing, fresh]), \
+                patch.dict(os.environ, REDSHIFT_ENV):
+            source = RedshiftDataSource()
+            with pytest.raises(psycopg2.OperationalError):
+                source.get_errors_summary(range_days=7)
+            result = source.get_errors_summary(range_days=7)
+            source.close()
+
+        assert failing.closed
+        assert result["rows"] == [("FAC001",)]
+        assert repr(fresh.executed[0][0]).startswith("Composed([SQL('PREPARE ')")
+
+    def test_redshift_prepared_parameter_types_declared_per_query(self):
+        """Verify PREPARE declares each query's parameter types, whatever the first call passes."""
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
+
+        conn = FakeConnection(columns=("facility_id",))
+        conn.prepared_statements = set()
+
+        with patch("psycopg2.connect", return_value=conn), patch.dict(os.environ, REDSHIFT_ENV):
+            source = RedshiftDataSource()
+            source.get_errors_summary(range_days=7, facility_id=101)
+            source.get_errors_summary(range_days=7, facility_id="FAC001")
+            source.close()
+
+        prepare = repr(conn.executed[0][0])
+        assert "SQL('INTEGER'), SQL(', '), SQL('VARCHAR'), SQL(', '), SQL('VARCHAR')" in prepare
+        assert len(conn.executed) == 3
+
+    def test_redshift_top_error_messages_approximate_samples(self):
+        """Verify the approximate top errors query samples rows and scales counts."""
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
+
+        conn = FakeConnection(
+            [("Sensor timeout", "E100", 40, "critical")],
+            columns=("error_message", "error_code", "count", "severity"),
+        )
+
+        with patch("psycopg2.connect", return_value=conn), \
+                patch.dict(os.environ, {**REDSHIFT_ENV, "REDSHIFT_TOPK_SAMPLE_PCT": "25"}):
+            source = RedshiftDataSource()
+            exact = source.get_top_error_messages(range_days=7, limit=5)
+            approx = source.get_top_error_messages(range_days=7, limit=5, approximate=True)
+            source.close()
+
+        (exact_query, exact_params), (approx_query, approx_params) = conn.executed
+        assert "RANDOM()" not in repr(exact_query)
+        assert len(exact_params) == 4
+        assert "RANDOM()" in repr(approx_query)
+        assert approx_params[1:] == (None, None, 0.25, 5)
+        assert "sample_pct" not in exact["metadata"]
+        assert approx["metadata"]["sample_pct"] == 25
+
+    def test_redshift_facility_summary_single_scans(self):
+        """Verify facility summary reads metadata and errors in one statement and unpivots."""
+        from backend.batch.utilities.helpers.trackman.redshift_data_source import RedshiftDataSource
+
+        conn = FakeConnection(
+            [("12", "3", "FAC001", "New York", "9am-9pm", "ACTIVE", "5", "245.5", "125000", "8")],
+            [("0", None, None, None, None, None, None, None, None, None)],
+        )
+
+        with patch("psycopg2.connect", return_value=conn), \
+                patch.dict(os.environ, REDSHIFT_ENV):
+            source = RedshiftDataSource()
+            result = source.get_facility_summary(facility_id="FAC001", range_days=30)
+            unknown = source.get_facility_summary(facility_id="FAC404", range_days=30)
+            source.close()
+
+        assert len(conn.executed) == 2
+        assert conn.executed[0][1] == ("FAC001", 30, "FAC001")
+        assert result["columns"] == ["metric", "value"]
+        assert dict(result["rows"]) == {
+            "location": "New York",
+            "opening_hours": "9am-9pm",
+            "subscription_status": "ACTIVE",
+            "units_deployed": "5",
+            "usage_hours_30d": "245.5",
+            "strokes_tracked": "125000",
+            "tournaments_hosted": "8",
+            "errors_total": "12",
+            "errors_critical": "3",
+        }
+        assert result["metadata"]["rowCount"] == 9
+        # Without a metadata row only the error counts are reported
+        assert unknown["rows"] == [("errors_total", "0"), ("errors_critical", None)]
 
 
 if __name__ == "__main__":